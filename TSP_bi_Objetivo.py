@@ -5,122 +5,299 @@ from utils import (    evaluar_M1,
     evaluar_error,
     construir_frente_Ytrue,
     leer_instancia_tsp,
+    cargar_instancia,
     calcular_costos,    
+    apilar_matrices,
+    evaluar_poblacion,
     generar_poblacion_inicial,
     calcular_frentes,
+    indices_no_dominados,
+    matriz_dominancia,
     domina,
     generar_ruta_aleatoria,
     crossover_OX,   
     mutacion_swap,
-    seleccion_torneo
+    generar_descendencia,
+    seleccion_torneo,
+    seleccion_torneo_lote,
+    crear_generador,
+    huella_instancia,
 
 )
 
 import math
+import itertools
 import random
 random.seed(42)  # Semilla fija para reproducibilidad
 import csv
 import os    
+import numpy as np
+
+from metricas import evaluar_frentes
+from busqueda_local import BusquedaLocal, OPCIONES_BUSQUEDA_LOCAL
+from cache_rutas import crear_control_duplicados, descartar_duplicados
+from checkpoint import guardar_checkpoint, cargar_checkpoint
+from instrumentacion import SIN_INSTRUMENTACION
+from parada import crear_criterio_parada
+from poblacion import Poblacion
+
+# Parámetros usados en las corridas repetidas de cada algoritmo
+PARAMETROS_NSGA = {"tam_poblacion": 150, "generaciones": 100}
+PARAMETROS_SPEA = {"tam_poblacion": 150, "tamano_archivo": 75, "generaciones": 100}
 
 
 
 #Paso 5: Distancia de hacinamiento (crowding distance)
 def distancia_hacinamiento(costos, frente):
-    n = len(frente) # Número de individuos en el frente
-    dist = [0.0] * n    # Inicializamos todas las distancias en cero
-    for m in range(2):  # Iteramos sobre los dos objetivos
-        # Obtenemos los valores del objetivo m para los individuos del frente
-        valores = [costos[i][m] for i in frente]
-        # Ordenamos los índices del frente según el valor del objetivo m
-        orden = sorted(range(n), key=lambda idx: costos[frente[idx]][m])
-        # Asignamos infinita distancia a los extremos para conservar la diversidad
-        dist[orden[0]] = float('inf')
-        dist[orden[-1]] = float('inf')
-        max_val = valores[orden[-1]]
-        min_val = valores[orden[0]]
-        # Evitamos división por cero
-        if max_val == min_val:
-            continue
-        # Calculamos la distancia normalizada para los individuos intermedios
-        for i in range(1, n-1):
-            dist[orden[i]] += (valores[orden[i+1]] - valores[orden[i-1]]) / (max_val - min_val)
-    return dist # Devuelve un vector con la distancia de hacinamiento para cada individuo del frente
-
+    # Devuelve un vector con la distancia de hacinamiento para cada individuo del frente
+    costos = np.asarray(costos, dtype=float)
+    return distancias_hacinamiento(costos[frente], np.zeros(len(frente), dtype=int)).tolist()
+
+# Distancia de hacinamiento de todos los frentes en una pasada por objetivo: se ordena por (rango, valor)
+# y en cada frente los extremos reciben distancia infinita y el resto la diferencia normalizada entre
+# sus vecinos. ranks indica el frente de cada individuo; los de rango negativo se ignoran (distancia 0)
+def distancias_hacinamiento(costos, ranks):
+    costos = np.asarray(costos, dtype=float)
+    ranks = np.asarray(ranks)
+    dist = np.zeros(len(ranks))
+    if len(ranks) == 0:
+        return dist
+    posiciones = np.arange(len(ranks))
+    for m in range(costos.shape[1]):
+        # Ordenamiento estable: dentro de un frente, a igual valor se respeta el orden de los índices
+        orden = np.lexsort((costos[:, m], ranks))
+        orden = orden[ranks[orden] >= 0]
+        valores = costos[orden, m]
+        rango = ranks[orden]
+        inicio = np.r_[True, rango[1:] != rango[:-1]]
+        fin = np.r_[rango[1:] != rango[:-1], True]
+        # Posición del primer y del último elemento del frente de cada individuo (mínimo y máximo)
+        primero = np.maximum.accumulate(np.where(inicio, posiciones[:len(orden)], 0))
+        ultimo = np.minimum.accumulate(np.where(fin, posiciones[:len(orden)], len(orden))[::-1])[::-1]
+        amplitud = valores[ultimo] - valores[primero]
+        interior = ~inicio & ~fin & (amplitud > 0)
+        i = posiciones[:len(orden)][interior]
+        dist[orden[i]] += (valores[i + 1] - valores[i - 1]) / amplitud[i]
+        # Extremos con distancia infinita para conservar la diversidad
+        dist[orden[inicio | fin]] = np.inf
+    return dist
+
+# Frente (rango) de cada individuo a partir de la lista de frentes
+def rangos(frentes, tamano):
+    ranks = np.full(tamano, -1)
+    for rango, frente in enumerate(frentes):
+        ranks[frente] = rango
+    return ranks
+
+
+# Supervivencia elitista (μ+λ): recibe los frentes de padres + hijos (ordenados una sola vez) y admite
+# frentes completos mientras entren; del último frente, que entra solo en parte, se eligen los de mayor
+# hacinamiento con una selección parcial (argpartition) en lugar de ordenar el frente completo.
+# El hacinamiento se calcula en lote solo para los frentes admitidos.
+# Devuelve los índices admitidos con su rango y su distancia de hacinamiento, listos para el torneo
+def supervivencia_elitista(costos, frentes, tam_poblacion):
+    # Frentes necesarios para completar la población
+    acumulado, necesarios = 0, 0
+    while acumulado < tam_poblacion and necesarios < len(frentes):
+        acumulado += len(frentes[necesarios])
+        necesarios += 1
+    ranks = rangos(frentes[:necesarios], len(costos))
+    dist = distancias_hacinamiento(costos, ranks)
+
+    elegidos = [np.asarray(frente) for frente in frentes[:necesarios - 1]]
+    ultimo = np.asarray(frentes[necesarios - 1]) if necesarios else np.empty(0, dtype=int)
+    restantes = tam_poblacion - (acumulado - len(ultimo))
+    if len(ultimo) > restantes:
+        ultimo = ultimo[np.sort(np.argpartition(-dist[ultimo], restantes - 1)[:restantes])]
+    elegidos = np.concatenate(elegidos + [ultimo]).astype(np.intp)
+    return elegidos, ranks[elegidos], dist[elegidos]
+
+# Ordena una población completa (sin descartar a nadie) en orden de frentes, en el lugar, y devuelve
+# rangos y distancias; se usa con la población inicial o tras recibir migrantes
+def clasificar(poblacion):
+    elegidos, ranks, distancias = supervivencia_elitista(poblacion.costos, calcular_frentes(poblacion.costos),
+                                                         len(poblacion))
+    poblacion.conservar(elegidos)
+    return ranks, distancias
+
+# Una generación de NSGA-II sobre una Poblacion de capacidad 2 * tam_poblacion: torneo sobre los padres
+# (con los rangos y distancias que trae cada uno), hijos escritos a continuación de los padres y
+# supervivencia elitista de padres + hijos, que quedan como la nueva población
+# Devuelve los rangos y distancias de los sobrevivientes y los frentes de la unión
+# generador: numpy.random.Generator de la corrida (utils.crear_generador), usado por el torneo en lote
+# cache y eliminar_duplicados: ver cache_rutas.crear_control_duplicados
+def generacion_nsga2(poblacion, ranks, distancias, tam_poblacion, matrices, prob_mutacion, rng, generador,
+                     estadisticas=None, busqueda=None, instr=SIN_INSTRUMENTACION, cache=None, eliminar_duplicados=False):
+    # Seleccionamos padres usando torneo basado en rango y hacinamiento, todos en una sola llamada
+    # (se seleccionan índices para que cada padre lleve también su costo)
+    with instr.fase("seleccion"):
+        elegidos = seleccion_torneo_lote(ranks, distancias, len(poblacion), generador)
+        seleccion = poblacion.rutas[elegidos]
+        costos_seleccion = poblacion.costos[elegidos]
+
+    # Aplicamos cruzamiento y mutación; los hijos (con sus costos) se escriben detrás de los padres
+    hijos, costos_hijos = generar_descendencia(seleccion, costos_seleccion, tam_poblacion, matrices, prob_mutacion,
+                                               rng, estadisticas, instr, poblacion.reservar(tam_poblacion), cache)
+    # Etapa memética opcional: mejora local de los hijos
+    if busqueda is not None:
+        with instr.fase("busqueda_local"):
+            hijos[:], costos_hijos[:] = busqueda.mejorar_poblacion(hijos, costos_hijos, rng)
+    # Opcional: una sola copia de cada ruta compite en la supervivencia (mientras alcancen para llenarla)
+    if eliminar_duplicados:
+        with instr.fase("duplicados"):
+            descartar_duplicados(poblacion, tam_poblacion, estadisticas)
+
+    # Padres e hijos compiten juntos (la unión es la población completa, sin copias):
+    # un único ordenamiento por generación
+    with instr.fase("ordenamiento"):
+        frentes = calcular_frentes(poblacion.costos)
+    with instr.fase("hacinamiento"):
+        elegidos, ranks, distancias = supervivencia_elitista(poblacion.costos, frentes, tam_poblacion)
+        poblacion.conservar(elegidos)
+    return ranks, distancias, frentes
 
 #Paso 8: NSGA-II completo (simplificado)
-def nsga2(num_ciudades, matriz1, matriz2, tam_poblacion=150, generaciones=100, prob_mutacion=0.2):
-    # Generamos una población inicial de rutas aleatorias
-    poblacion = generar_poblacion_inicial(num_ciudades, tam_poblacion)
-
-    for gen in range(generaciones): # Iteramos sobre cada generación
-        # Calculamos los costos (2 objetivos) de cada individuo
-        costos = [calcular_costos(ind, matriz1, matriz2) for ind in poblacion]
-        # Calculamos los frentes de Pareto usando dominancia
-        frentes = calcular_frentes(costos)
-
-        nueva_poblacion = []
-        for frente in frentes:
-            # Calculamos la distancia de hacinamiento para cada frente
-            dist = distancia_hacinamiento(costos, frente)
-            # Ordenamos el frente en base a la distancia (más diversidad primero)
-            orden_frente = sorted(zip(frente, dist), key=lambda x: -x[1])  # solo crowding distance
-            # Agregamos individuos al nuevo conjunto
-            for i, _ in orden_frente:
-                nueva_poblacion.append(poblacion[i])
-            # Si ya llenamos la población, detenemos el proceso
-            if len(nueva_poblacion) >= tam_poblacion:
-                nueva_poblacion = nueva_poblacion[:tam_poblacion]
-                break
-
-
-        # Recalculamos costos y frentes para la nueva población
-        costos = [calcular_costos(ind, matriz1, matriz2) for ind in nueva_poblacion]
-        frentes = calcular_frentes(costos)
-
-        # Calculamos distancias de hacinamiento para selección por torneo
-        distancias = []
-        for frente in frentes:
-            distancias += distancia_hacinamiento(costos, frente)
-
-        # Asignamos rango (nivel de frente) a cada individuo
-        ranks = [0]*len(nueva_poblacion)
-        for i, frente in enumerate(frentes):
-            for ind in frente:
-                ranks[ind] = i
-
-        # Seleccionamos padres usando torneo basado en rango y hacinamiento 
-        seleccion = seleccion_torneo(nueva_poblacion, costos, ranks, distancias)
-
-        # Aplicamos cruzamiento y mutación para crear la siguiente generación
-        siguiente_poblacion = []
-        for i in range(0, tam_poblacion, 2):
-            padre1 = seleccion[i]
-            padre2 = seleccion[(i+1) % tam_poblacion]
-            hijo1 = crossover_OX(padre1, padre2)
-            hijo2 = crossover_OX(padre2, padre1)
-            hijo1 = mutacion_swap(hijo1, prob_mutacion)
-            hijo2 = mutacion_swap(hijo2, prob_mutacion)
-            siguiente_poblacion.extend([hijo1, hijo2])
-
-        poblacion = siguiente_poblacion[:tam_poblacion] # Actualizamos población
-
+# rng: generador propio de la corrida (random.Random(semilla)); por defecto el módulo random global
+# Si matriz2 es None, matriz1 es la instancia completa devuelta por cargar_instancia
+# estadisticas: diccionario opcional donde se acumulan las evaluaciones completas e incrementales
+# busqueda_local: None (desactivada) o diccionario con opciones de busqueda_local.OPCIONES_BUSQUEDA_LOCAL
+# checkpoint: ruta de un archivo donde se guarda el estado cada intervalo_checkpoint generaciones;
+# si ya existe, la corrida continúa desde la generación guardada
+# duplicados: None (desactivado), True o diccionario con opciones de cache_rutas.OPCIONES_DUPLICADOS
+# (caché de costos por huella canónica de la ruta y eliminación de rutas repetidas); los aciertos y fallos
+# de la caché y las rutas descartadas quedan en estadisticas
+# instrumentacion: instrumentacion.Instrumentacion que recibe tiempos por fase y datos de cada generación
+# parada: None o diccionario con opciones de parada.OPCIONES_PARADA (tiempo, evaluaciones, estancamiento);
+# con parada, generaciones=None deja la cantidad de generaciones sin límite (ValueError si ningún criterio
+# puede terminar la corrida). El motivo de parada y las generaciones ejecutadas quedan en
+# estadisticas["motivo_parada"] y estadisticas["generaciones"]
+def nsga2(num_ciudades, matriz1, matriz2=None, tam_poblacion=150, generaciones=100, prob_mutacion=0.2, rng=None, estadisticas=None,
+          busqueda_local=None, checkpoint=None, intervalo_checkpoint=10, instrumentacion=None, parada=None, duplicados=None):
+    rng = random if rng is None else rng
+    instr = SIN_INSTRUMENTACION if instrumentacion is None else instrumentacion
+    criterio = crear_criterio_parada(parada, generaciones)
+    cache, eliminar_duplicados = crear_control_duplicados(duplicados)
+    if (instr.activa or criterio is not None) and estadisticas is None:
+        estadisticas = {}  # la telemetría y el presupuesto usan las evaluaciones aunque el llamador no las pida
+    # Apilamos ambas matrices en un arreglo (2, n, n) para evaluar en bloque
+    matrices = apilar_matrices(matriz1, matriz2)
+    busqueda = crear_busqueda_local(matrices, busqueda_local, estadisticas)
+    config = {"algoritmo": "NSGA-II", "num_ciudades": num_ciudades, "tam_poblacion": tam_poblacion,
+              "instancia": huella_instancia(matrices) if checkpoint else None,
+              **opciones_corrida(generaciones, prob_mutacion, busqueda_local, duplicados, parada)}
+    estado = reanudar(checkpoint, config, rng, estadisticas)
+    # Padres e hijos comparten un mismo bloque de rutas (ver poblacion.Poblacion)
+    poblacion = Poblacion(2 * tam_poblacion, num_ciudades, matrices.shape[0])
+    if estado is not None:
+        poblacion.cargar(estado["poblacion"], estado["costos"])
+        inicio, generador = estado["gen"], estado["generador"]
+        ranks, distancias = estado["ranks"], estado["distancias"]
+        estado_parada = estado.get("parada")
+        cache = estado.get("cache", cache)
+    else:
+        generador = crear_generador(rng)
+        # Generamos una población inicial de rutas aleatorias
+        rutas = generar_poblacion_inicial(num_ciudades, tam_poblacion, rng)
+        # Calculamos los costos (2 objetivos) de toda la población en una sola llamada;
+        # en adelante cada individuo lleva su costo consigo y no se vuelve a evaluar
+        evaluar = evaluar_poblacion if cache is None else cache.evaluar
+        poblacion.cargar(rutas, evaluar(rutas, matrices, estadisticas))
+        # Rango y hacinamiento de cada individuo: se actualizan en la supervivencia de cada generación
+        ranks, distancias = clasificar(poblacion)
+        inicio = 0
+        estado_parada = None
+    if criterio is not None:
+        criterio.iniciar(estado_parada)
+    instr.iniciar(algoritmo="NSGA-II", num_ciudades=num_ciudades, tam_poblacion=tam_poblacion,
+                  generaciones=generaciones, desde=inicio)
+    instr.seguir(estadisticas)
+
+    motivo, gen = "generaciones", inicio - 1
+    for gen in iterar_generaciones(inicio, generaciones): # Iteramos sobre cada generación
+        ranks, distancias, frentes = generacion_nsga2(poblacion, ranks, distancias, tam_poblacion, matrices,
+                                                      prob_mutacion, rng, generador, estadisticas, busqueda, instr,
+                                                      cache, eliminar_duplicados)
+
+        # Criterios de parada sobre el primer frente de los sobrevivientes (rango 0)
+        if criterio is not None:
+            with instr.fase("parada"):
+                costos_frente = poblacion.costos[:np.count_nonzero(ranks == 0)]  # queda en orden de frentes
+                motivo = criterio.actualizar(costos_frente, estadisticas.get("evaluaciones", 0)) or motivo
+
+        if checkpoint and (gen + 1) % intervalo_checkpoint == 0:
+            with instr.fase("checkpoint"):
+                guardar_checkpoint(checkpoint, config, {"gen": gen + 1, "poblacion": poblacion.rutas,
+                                                        "costos": poblacion.costos, "ranks": ranks, "distancias": distancias,
+                                                        "estadisticas": dict(estadisticas or {}),
+                                                        "parada": criterio and criterio.estado(), "cache": cache},
+                                   rng, generador)
+
+        if instr.activa:
+            datos_frente = {}
+            if instr.frentes:
+                datos_frente["frente"] = poblacion.costos[:np.count_nonzero(ranks == 0)].tolist()
+            instr.fin_generacion(gen, tamanos_frentes=[len(frente) for frente in frentes], **datos_frente,
+                                 **estadisticas)
+        if criterio is not None and criterio.motivo:
+            break
+
+    registrar_parada(estadisticas, motivo, gen + 1)
     # Al final, devolver el conjunto Pareto de la última generación
-    costos_final = [calcular_costos(ind, matriz1, matriz2) for ind in poblacion]
-    frentes_finales = calcular_frentes(costos_final)
-    frente_pareto = [poblacion[i] for i in frentes_finales[0]]
-    costos_pareto = [costos_final[i] for i in frentes_finales[0]]
+    resultado = extraer_frente_pareto(poblacion.rutas, poblacion.costos, matrices)
+    instr.finalizar(tamano_frente=len(resultado[0]), **(estadisticas or {}))
+    return resultado
+
+
+# Opciones que, junto con el algoritmo, los tamaños y la huella de la instancia, identifican una corrida
+# en su checkpoint: continuar con otras mezclaría dos configuraciones, así que cargar_checkpoint lo rechaza
+def opciones_corrida(generaciones, prob_mutacion, busqueda_local, duplicados, parada):
+    return {"generaciones": generaciones, "prob_mutacion": prob_mutacion, "busqueda_local": busqueda_local,
+            "duplicados": duplicados, "parada": parada}
+
+# Estado guardado en el checkpoint (o None si no hay); restaura también rng y las estadísticas
+def reanudar(checkpoint, config, rng, estadisticas):
+    if not checkpoint:
+        return None
+    estado = cargar_checkpoint(checkpoint, config, rng)
+    if estado is not None and estadisticas is not None:
+        estadisticas.clear()
+        estadisticas.update(estado["estadisticas"])
+    return estado
+
+# Generaciones a recorrer; sin límite (generaciones=None) solo se termina por un criterio de parada
+def iterar_generaciones(inicio, generaciones):
+    return itertools.count(inicio) if generaciones is None else range(inicio, generaciones)
+
+def registrar_parada(estadisticas, motivo, generaciones):
+    if estadisticas is not None:
+        estadisticas["motivo_parada"] = motivo
+        estadisticas["generaciones"] = generaciones
+
+# Crea la búsqueda local (listas de candidatos incluidas) a partir de las opciones recibidas
+def crear_busqueda_local(matrices, opciones, estadisticas=None):
+    if opciones is None or opciones is False:
+        return None
+    opciones = {**OPCIONES_BUSQUEDA_LOCAL, **(opciones if isinstance(opciones, dict) else {})}
+    return BusquedaLocal(matrices, **opciones, estadisticas=estadisticas)
+
+# Frente no dominado final; sus costos se reevalúan por completo para
+# no arrastrar el redondeo de las actualizaciones incrementales
+def extraer_frente_pareto(poblacion, costos, matrices):
+    indices = calcular_frentes(costos)[0]
+    frente_pareto = np.asarray(poblacion)[indices].tolist()
+    costos_pareto = [tuple(c) for c in evaluar_poblacion(frente_pareto, matrices).tolist()]
     return frente_pareto, costos_pareto
 
 
 #PASO 9: Ejecutar NSGA-II 5 veces y guardar los resultados
 def ejecutar_nsga_varias_veces(instancia_path, repeticiones=5):
-    num_ciudades, matriz1, matriz2 = leer_instancia_tsp(instancia_path)
+    num_ciudades, matrices = cargar_instancia(instancia_path)
     frentes_todas = []
 
     for i in range(repeticiones):
-        random.seed(42 + i) # Cambiamos la semilla en cada repetición
+        rng = random.Random(42 + i) # Cambiamos la semilla en cada repetición
         print(f"Ejecutando corrida {i+1}...")
-        frente_pareto, costos_pareto = nsga2(num_ciudades, matriz1, matriz2, 150, 100)
+        frente_pareto, costos_pareto = nsga2(num_ciudades, matrices, None, **PARAMETROS_NSGA, rng=rng)
         frentes_todas.append(costos_pareto)
 
     return frentes_todas
@@ -130,148 +307,197 @@ def ejecutar_nsga_varias_veces(instancia_path, repeticiones=5):
 #Función para obtener métricas promediadas de 5 ejecuciones:
 def evaluar_algoritmo_nsga(instancia_path, repeticiones=5):
     frentes_algo = ejecutar_nsga_varias_veces(instancia_path, repeticiones)
-    frente_completo = [c for frente in frentes_algo for c in frente]
-    ytrue = construir_frente_Ytrue(frentes_algo)
+    return evaluar_frentes_algoritmo(frentes_algo)
 
-    m1s, m2s, m3s, errors = [], [], [], []
+# Métricas promediadas de un conjunto de frentes ya calculados (uno por corrida)
+def evaluar_frentes_algoritmo(frentes_algo):
+    ytrue = construir_frente_Ytrue(frentes_algo)
 
-    for frente in frentes_algo:
-        m1s.append(evaluar_M1(frente, ytrue))       # Cobertura
-        m2s.append(evaluar_M2(frente, ytrue))       # Uniformidad
-        m3s.append(evaluar_M3(frente))              # Dispersión
-        errors.append(evaluar_error(frente, ytrue)) # Error global
+    # Todas las corridas se evalúan contra Ytrue en una sola llamada
+    metricas = evaluar_frentes(frentes_algo, ytrue)
 
     # Retorna los promedios de las métricas y datos relevantes
-    return {
-        "M1": sum(m1s) / repeticiones,
-        "M2": sum(m2s) / repeticiones,
-        "M3": sum(m3s) / repeticiones,
-        "Error": sum(errors) / repeticiones,
-        "Ytrue": ytrue,
-        "Frentes": frentes_algo
-    }
+    resumen = {nombre: float(valores.mean()) for nombre, valores in metricas.items()}
+    resumen["Ytrue"] = ytrue
+    resumen["Frentes"] = frentes_algo
+    return resumen
 
 #SPEA para TSP Bi-objetivo
 #Paso 1: Fuerza (strength) y aptitud (fitness)
-def calcular_strengths(costos):
-    n = len(costos)
-    strengths = [0] * n
-    for i in range(n):
-        for j in range(n):
-            if domina(costos[i], costos[j]):
-                strengths[i] += 1
-    return strengths
-
-def calcular_fitness(costos, strengths):
-    n = len(costos)
-    fitness = [0] * n
-    for i in range(n):
-        for j in range(n):
-            if domina(costos[j], costos[i]):
-                fitness[i] += strengths[j]
-    return fitness
+# Ambas se obtienen de una única matriz de dominancia sobre el arreglo de costos
+
+# Fuerza: cantidad de soluciones que domina cada una
+def calcular_strengths(costos, dominancia=None):
+    if dominancia is None:
+        dominancia = matriz_dominancia(costos)
+    return dominancia.sum(axis=1)
+
+# Aptitud cruda: suma de las fuerzas de quienes dominan a cada solución (0 = no dominada)
+def calcular_fitness(costos, strengths, dominancia=None):
+    if dominancia is None:
+        dominancia = matriz_dominancia(costos)
+    return dominancia.T.astype(float) @ np.asarray(strengths, dtype=float)
+
+# Aptitud SPEA2: aptitud cruda + densidad por el k-ésimo vecino más cercano en el espacio de objetivos
+# Devuelve también la matriz de distancias para reutilizarla en el truncamiento del archivo
+def calcular_fitness_spea2(costos):
+    c = np.asarray(costos, dtype=float)
+    dominancia = matriz_dominancia(c)
+    strengths = calcular_strengths(c, dominancia)
+    crudo = calcular_fitness(c, strengths, dominancia)
+
+    distancias = np.sqrt(((c[:, np.newaxis, :] - c[np.newaxis, :, :]) ** 2).sum(axis=2))
+    k = int(math.sqrt(len(c)))
+    # La columna 0 de cada fila ordenada es la distancia a sí misma
+    sigma_k = np.sort(distancias, axis=1)[:, min(k, len(c) - 1)]
+    densidad = 1.0 / (sigma_k + 2.0)  # siempre < 1, no altera el orden entre niveles de dominancia
+    return crudo + densidad, distancias
+
+# Truncamiento iterativo de SPEA2: mientras sobren soluciones, elimina la que tenga
+# la menor distancia a sus vecinos (comparando lexicográficamente la 1ra, 2da, ... más cercana)
+def truncar_archivo(distancias, indices, tamano_archivo):
+    indices = np.asarray(indices)
+    sub = distancias[np.ix_(indices, indices)].copy()
+    np.fill_diagonal(sub, np.inf)
+    activos = np.ones(len(indices), dtype=bool)
+    for _ in range(len(indices) - tamano_archivo):
+        vivos = np.flatnonzero(activos)
+        vecinos = np.sort(sub[np.ix_(vivos, vivos)], axis=1)
+        # np.lexsort usa la última clave como principal: invertimos las columnas
+        peor = np.lexsort(vecinos.T[::-1])[0]
+        activos[vivos[peor]] = False
+    return indices[activos]
+
+# Selección ambiental de SPEA2: todos los no dominados (aptitud < 1);
+# si faltan se completa con los mejores dominados, si sobran se trunca
+def seleccion_ambiental(fitness, distancias, tamano_archivo):
+    no_dominados = np.flatnonzero(fitness < 1)
+    if len(no_dominados) > tamano_archivo:
+        return truncar_archivo(distancias, no_dominados, tamano_archivo)
+    return np.argsort(fitness, kind="stable")[:tamano_archivo]
 
 
 #Paso 2: Filtrado de no dominados
 def filtrar_no_dominados(costos, poblacion):
-    no_dominados = []
-    for i, ci in enumerate(costos):
-        es_dominado = False
-        for j, cj in enumerate(costos):
-            if i != j and domina(cj, ci):
-                es_dominado = True
-                break
-        if not es_dominado:
-            no_dominados.append((poblacion[i], ci))
-    return no_dominados
+    return [(poblacion[i], costos[i]) for i in indices_no_dominados(costos)]
 
 
 #Paso 3: SPEA completo
-def spea(num_ciudades, matriz1, matriz2, tam_poblacion=150, tamano_archivo=75, generaciones=100, prob_mutacion=0.2):
-    poblacion = generar_poblacion_inicial(num_ciudades, tam_poblacion)
-    archivo = []
-
-    for gen in range(generaciones):
-        union = archivo + poblacion
-        costos_union = [calcular_costos(ind, matriz1, matriz2) for ind in union]
-        
-        strengths = calcular_strengths(costos_union)
-        fitness = calcular_fitness(costos_union, strengths)
-
-        # Selección de archivo: guardar no dominados hasta llenar el archivo
-        candidatos = list(zip(union, costos_union, fitness))
-        candidatos.sort(key=lambda x: x[2])  # ordenar por fitness
-        archivo = [ind for ind, _, _ in candidatos[:tamano_archivo]]
-
-        if len(archivo) == 0:
-            archivo = random.choices(poblacion, k=tamano_archivo)
-
-        # Selección de padres desde el archivo
-        costos_archivo = [calcular_costos(ind, matriz1, matriz2) for ind in archivo]
-        seleccion = []
-        while len(seleccion) < tam_poblacion:
-            nuevos = seleccion_torneo(archivo, costos_archivo, [0]*len(archivo), [1]*len(archivo))
-            if not nuevos:
-                nuevos = random.choices(archivo, k=2)  # permite duplicados si es necesario
-            seleccion += nuevos
-
-        seleccion = seleccion[:tam_poblacion]
-
-        # Reproducir para generar nueva población
-        nueva_poblacion = []
-        for i in range(0, tam_poblacion, 2):
-            p1 = seleccion[i % len(seleccion)]
-            p2 = seleccion[(i+1) % len(seleccion)]
-            h1 = crossover_OX(p1, p2)
-            h2 = crossover_OX(p2, p1)
-            h1 = mutacion_swap(h1, prob_mutacion)
-            h2 = mutacion_swap(h2, prob_mutacion)
-            nueva_poblacion.extend([h1, h2])
-        
-        poblacion = nueva_poblacion[:tam_poblacion]
-
+def spea(num_ciudades, matriz1, matriz2=None, tam_poblacion=150, tamano_archivo=75, generaciones=100, prob_mutacion=0.2, rng=None, estadisticas=None,
+         busqueda_local=None, checkpoint=None, intervalo_checkpoint=10, instrumentacion=None, parada=None, duplicados=None):
+    rng = random if rng is None else rng
+    instr = SIN_INSTRUMENTACION if instrumentacion is None else instrumentacion
+    criterio = crear_criterio_parada(parada, generaciones)
+    cache, eliminar_duplicados = crear_control_duplicados(duplicados)
+    if (instr.activa or criterio is not None) and estadisticas is None:
+        estadisticas = {}
+    matrices = apilar_matrices(matriz1, matriz2)
+    busqueda = crear_busqueda_local(matrices, busqueda_local, estadisticas)
+    config = {"algoritmo": "SPEA", "num_ciudades": num_ciudades, "tam_poblacion": tam_poblacion,
+              "tamano_archivo": tamano_archivo, "instancia": huella_instancia(matrices) if checkpoint else None,
+              **opciones_corrida(generaciones, prob_mutacion, busqueda_local, duplicados, parada)}
+    estado = reanudar(checkpoint, config, rng, estadisticas)
+    # El archivo ocupa las primeras filas del bloque y la población (hijos) las siguientes:
+    # la unión archivo + población es el bloque completo, sin copias
+    union = Poblacion(tamano_archivo + tam_poblacion, num_ciudades, matrices.shape[0])
+    if estado is not None:
+        union.cargar(estado["archivo"] + estado["poblacion"],
+                     np.concatenate([estado["costos_archivo"], estado["costos"]]))
+        tam_archivo = len(estado["archivo"])
+        inicio, generador = estado["gen"], estado["generador"]
+        estado_parada = estado.get("parada")
+        cache = estado.get("cache", cache)
+    else:
+        generador = crear_generador(rng)
+        poblacion = generar_poblacion_inicial(num_ciudades, tam_poblacion, rng)
+        evaluar = evaluar_poblacion if cache is None else cache.evaluar
+        union.cargar(poblacion, evaluar(poblacion, matrices, estadisticas))
+        tam_archivo = 0
+        inicio = 0
+        estado_parada = None
+    if criterio is not None:
+        criterio.iniciar(estado_parada)
+    instr.iniciar(algoritmo="SPEA", num_ciudades=num_ciudades, tam_poblacion=tam_poblacion,
+                  tamano_archivo=tamano_archivo, generaciones=generaciones, desde=inicio)
+    instr.seguir(estadisticas)
+
+    motivo, gen = "generaciones", inicio - 1
+    for gen in iterar_generaciones(inicio, generaciones):
+        # Opcional: una sola copia de cada ruta entre archivo y población (mientras alcancen para el archivo)
+        if eliminar_duplicados:
+            with instr.fase("duplicados"):
+                descartar_duplicados(union, tamano_archivo, estadisticas)
+
+        # El archivo y la población ya traen sus costos: no se reevalúan
+        with instr.fase("aptitud"):
+            fitness, distancias = calcular_fitness_spea2(union.costos)
+
+        # Selección ambiental: no dominados, completados o truncados hasta el tamaño del archivo
+        with instr.fase("seleccion_ambiental"):
+            elegidos = seleccion_ambiental(fitness, distancias, tamano_archivo)
+            union.conservar(elegidos)
+            tam_archivo = len(elegidos)
+
+        # Selección de padres desde el archivo (torneo binario por aptitud, todos en una sola llamada)
+        with instr.fase("seleccion"):
+            seleccion = seleccion_torneo_lote(fitness[elegidos], np.zeros(tam_archivo), tam_poblacion, generador)
+            costos_seleccion = union.costos[seleccion]
+            seleccion = union.rutas[seleccion]
+
+        # Reproducir para generar nueva población (con sus costos), escrita a continuación del archivo
+        poblacion, costos_poblacion = generar_descendencia(seleccion, costos_seleccion, tam_poblacion, matrices,
+                                                           prob_mutacion, rng, estadisticas, instr,
+                                                           union.reservar(tam_poblacion), cache)
+        if busqueda is not None:
+            with instr.fase("busqueda_local"):
+                poblacion[:], costos_poblacion[:] = busqueda.mejorar_poblacion(poblacion, costos_poblacion, rng)
+
+        # Criterios de parada sobre los no dominados del archivo (aptitud < 1)
+        if criterio is not None:
+            with instr.fase("parada"):
+                motivo = criterio.actualizar(union.costos[:tam_archivo][fitness[elegidos] < 1],
+                                             estadisticas.get("evaluaciones", 0)) or motivo
+
+        if checkpoint and (gen + 1) % intervalo_checkpoint == 0:
+            with instr.fase("checkpoint"):
+                guardar_checkpoint(checkpoint, config, {"gen": gen + 1, "poblacion": poblacion, "costos": costos_poblacion,
+                                                        "archivo": union.rutas[:tam_archivo],
+                                                        "costos_archivo": union.costos[:tam_archivo],
+                                                        "estadisticas": dict(estadisticas or {}),
+                                                        "parada": criterio and criterio.estado(), "cache": cache},
+                                   rng, generador)
+
+        if instr.activa:
+            no_dominados = fitness[elegidos] < 1
+            datos_frente = {"frente": union.costos[:tam_archivo][no_dominados].tolist()} if instr.frentes else {}
+            instr.fin_generacion(gen, tamano_archivo=tam_archivo, no_dominados_archivo=int(no_dominados.sum()),
+                                 **datos_frente, **estadisticas)
+        if criterio is not None and criterio.motivo:
+            break
+
+    registrar_parada(estadisticas, motivo, gen + 1)
     # Al final: devolver soluciones no dominadas del archivo final
-    costos_final = [calcular_costos(ind, matriz1, matriz2) for ind in archivo]
-    frentes = calcular_frentes(costos_final)
-    frente_pareto = [archivo[i] for i in frentes[0]]
-    costos_pareto = [costos_final[i] for i in frentes[0]]
-    return frente_pareto, costos_pareto
+    resultado = extraer_frente_pareto(union.rutas[:tam_archivo], union.costos[:tam_archivo], matrices)
+    instr.finalizar(tamano_frente=len(resultado[0]), **(estadisticas or {}))
+    return resultado
 
 
 #Ejecución Múltiple y Métricas para SPEA
 def ejecutar_spea_varias_veces(instancia_path, repeticiones=5):
-    num_ciudades, matriz1, matriz2 = leer_instancia_tsp(instancia_path)
+    num_ciudades, matrices = cargar_instancia(instancia_path)
     frentes_todas = []
 
     for i in range(repeticiones):
-        random.seed(42 + i)
+        rng = random.Random(42 + i)
         print(f"Ejecutando SPEA corrida {i+1}...")
-        frente_pareto, costos_pareto = spea(num_ciudades, matriz1, matriz2, 150, 75, 100)
+        frente_pareto, costos_pareto = spea(num_ciudades, matrices, None, **PARAMETROS_SPEA, rng=rng)
         frentes_todas.append(costos_pareto)
 
     return frentes_todas
 
 def evaluar_algoritmo_spea(instancia_path, repeticiones=5):
     frentes_algo = ejecutar_spea_varias_veces(instancia_path, repeticiones)
-    frente_completo = [c for frente in frentes_algo for c in frente]
-    ytrue = construir_frente_Ytrue(frentes_algo)
-
-    m1s, m2s, m3s, errors = [], [], [], []
-
-    for frente in frentes_algo:
-        m1s.append(evaluar_M1(frente, ytrue))
-        m2s.append(evaluar_M2(frente, ytrue))
-        m3s.append(evaluar_M3(frente))
-        errors.append(evaluar_error(frente, ytrue))
-
-    return {
-        "M1": sum(m1s) / repeticiones,
-        "M2": sum(m2s) / repeticiones,
-        "M3": sum(m3s) / repeticiones,
-        "Error": sum(errors) / repeticiones,
-        "Ytrue": ytrue,
-        "Frentes": frentes_algo
-    }
+    return evaluar_frentes_algoritmo(frentes_algo)
 
 
 
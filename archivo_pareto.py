@@ -0,0 +1,126 @@
+import bisect
+
+import numpy as np
+
+
+# Archivo de Pareto para 2 objetivos (minimización)
+# Un conjunto no dominado es una escalera: ordenado por f1 creciente, f2 queda decreciente.
+# Se guarda así en dos listas paralelas (más una con un dato asociado a cada punto, p. ej. la ruta):
+#   - saber si un punto está dominado es una búsqueda binaria sobre f1
+#   - al insertar, los puntos que pasan a estar dominados son contiguos y se quitan de una vez
+# Con capacidad, al excederla se desaloja un punto interior (los extremos se conservan):
+#   "hacinamiento": el de menor distancia de hacinamiento
+#   "grilla": el de menor hacinamiento dentro de la celda más poblada de una grilla de divisiones x divisiones
+# Con un punto de referencia se mantiene además el hipervolumen, sumando o restando solo el área
+# que cambia en cada inserción o desalojo.
+
+class ArchivoPareto:
+    def __init__(self, capacidad=None, desalojo="hacinamiento", divisiones=10, referencia=None):
+        if capacidad is not None and capacidad < 2:
+            raise ValueError("La capacidad del archivo debe ser al menos 2 (se conservan los extremos)")
+        if desalojo not in ("hacinamiento", "grilla"):
+            raise ValueError(f"Desalojo desconocido: {desalojo!r} (use 'hacinamiento' o 'grilla')")
+        self.capacidad = capacidad
+        self.desalojo = desalojo
+        self.divisiones = divisiones
+        self.referencia = None if referencia is None else [float(v) for v in referencia]
+        self.hipervolumen = 0.0
+        self._f1, self._f2, self._datos = [], [], []
+
+    def __len__(self):
+        return len(self._f1)
+
+    # Costos (f1, f2) en orden de f1 creciente
+    def costos(self):
+        return list(zip(self._f1, self._f2))
+
+    def datos(self):
+        return list(self._datos)
+
+    # True si algún punto del archivo domina (o iguala) a (f1, f2)
+    def dominado(self, costo):
+        x, y = costo
+        k = bisect.bisect_right(self._f1, x)
+        # El de mayor f1 <= x es el de menor f2 entre ellos
+        return k > 0 and self._f2[k-1] <= y
+
+    # Inserta el punto si no está dominado, quitando los que pasa a dominar
+    # Devuelve True si el punto queda en el archivo; ValueError si el costo no tiene exactamente 2 objetivos
+    def insertar(self, costo, dato=None):
+        if len(costo) != 2:
+            raise ValueError(f"ArchivoPareto admite 2 objetivos; el costo tiene {len(costo)}")
+        x, y = float(costo[0]), float(costo[1])
+        if self.dominado((x, y)):
+            return False
+        f1, f2 = self._f1, self._f2
+        k = bisect.bisect_left(f1, x)
+        # Desde k, los puntos con f2 >= y están dominados por el nuevo
+        j = k
+        while j < len(f1) and f2[j] >= y:
+            j += 1
+        if self.referencia is not None:
+            self.hipervolumen += self._area_nueva(x, y, k, j)
+        f1[k:j] = [x]
+        f2[k:j] = [y]
+        self._datos[k:j] = [dato]
+        if self.capacidad is not None and len(f1) > self.capacidad:
+            return self._desalojar() != k
+        return True
+
+    def extender(self, costos, datos=None):
+        datos = [None] * len(costos) if datos is None else datos
+        for costo, dato in zip(costos, datos):
+            self.insertar(costo, dato)
+
+    # Área que agrega (x, y) recorriendo la escalera entre las posiciones k y j (los puntos que reemplaza),
+    # recortada al punto de referencia
+    def _area_nueva(self, x, y, k, j):
+        rx, ry = self.referencia
+        if x >= rx or y >= ry:
+            return 0.0
+        f1, f2 = self._f1, self._f2
+        nivel = min(f2[k-1], ry) if k > 0 else ry
+        actual, area = x, 0.0
+        for i in range(k, j):
+            siguiente = min(f1[i], rx)
+            area += (siguiente - actual) * (nivel - y)
+            actual, nivel = siguiente, min(f2[i], ry)
+        fin = min(f1[j], rx) if j < len(f1) else rx
+        return area + (fin - actual) * (nivel - y)
+
+    # Área que solo domina el punto i (se pierde al quitarlo)
+    def _area_exclusiva(self, i):
+        rx, ry = self.referencia
+        f1, f2 = self._f1, self._f2
+        derecha = min(f1[i+1], rx) if i + 1 < len(f1) else rx
+        arriba = min(f2[i-1], ry) if i > 0 else ry
+        return max(derecha - min(f1[i], rx), 0.0) * max(arriba - min(f2[i], ry), 0.0)
+
+    # Distancia de hacinamiento de los puntos interiores (los extremos no se consideran)
+    def _hacinamiento(self):
+        f1, f2 = np.array(self._f1), np.array(self._f2)
+        ancho1 = (f1[-1] - f1[0]) or 1.0
+        ancho2 = (f2[0] - f2[-1]) or 1.0
+        return (f1[2:] - f1[:-2]) / ancho1 + (f2[:-2] - f2[2:]) / ancho2
+
+    # Quita un punto interior según la política de desalojo y devuelve su posición
+    def _desalojar(self):
+        hacinamiento = self._hacinamiento()
+        candidatos = np.arange(1, len(self._f1) - 1)
+        if self.desalojo == "grilla":
+            f1, f2 = np.array(self._f1), np.array(self._f2)
+            celda1 = np.minimum(((f1 - f1[0]) / ((f1[-1] - f1[0]) or 1.0) * self.divisiones).astype(int),
+                                self.divisiones - 1)
+            celda2 = np.minimum(((f2 - f2[-1]) / ((f2[0] - f2[-1]) or 1.0) * self.divisiones).astype(int),
+                                self.divisiones - 1)
+            celdas = celda1 * self.divisiones + celda2
+            conteo = np.bincount(celdas, minlength=self.divisiones ** 2)
+            # Celda más poblada entre las que tienen algún punto interior
+            celdas_candidatos = celdas[candidatos]
+            en_celda = celdas_candidatos == celdas_candidatos[np.argmax(conteo[celdas_candidatos])]
+            candidatos, hacinamiento = candidatos[en_celda], hacinamiento[en_celda]
+        i = int(candidatos[np.argmin(hacinamiento)])
+        if self.referencia is not None:
+            self.hipervolumen -= self._area_exclusiva(i)
+        del self._f1[i], self._f2[i], self._datos[i]
+        return i
@@ -0,0 +1,186 @@
+import argparse
+import csv
+import inspect
+import itertools
+import json
+import os
+
+import numpy as np
+
+from paralelo import ALGORITMOS, ejecutar_en_paralelo
+from checkpoint import huella_trabajo, ruta_resultado
+from utils import construir_frente_Ytrue
+from metricas import evaluar_frentes
+from salida import EscritorSalida, guardar_frentes_npz
+
+
+# Barridos de parámetros: reemplaza a las carpetas "Config N" armadas a mano.
+# Cada combinación de parámetros es una configuración; cada (instancia, algoritmo, parámetros, semilla)
+# es un trabajo identificado por su huella. Los resultados se guardan en un almacén dentro del
+# directorio de salida y un trabajo ya guardado no se vuelve a ejecutar, aunque pertenezca a otro barrido.
+# Uso:
+#   python barrido.py --config barrido_configuraciones.json
+#   python barrido.py --tam-poblacion 100 150 --generaciones 100 200 --repeticiones 3
+
+INSTANCIAS = {
+    "KROAB100": "tsp_KROAB100.TSP.TXT",
+    "KROAC100": "tsp_kroac100.tsp.txt",
+}
+METRICAS = ["M1", "M2", "M3", "Error", "HV", "IGD+"]
+# Prefijos cortos para los nombres de las carpetas de cada configuración
+ABREVIATURAS = {"tam_poblacion": "pob", "generaciones": "gen", "prob_mutacion": "mut", "tamano_archivo": "arch"}
+
+
+#Paso 1: Configuraciones y trabajos
+# Producto cartesiano de una grilla {parametro: [valores]}
+def expandir_grilla(grilla):
+    claves = list(grilla)
+    return [dict(zip(claves, valores)) for valores in itertools.product(*(grilla[c] for c in claves))]
+
+# Un barrido en JSON puede dar una "grilla", una lista explícita de "configuraciones", o ambas
+def leer_barrido(ruta):
+    with open(ruta) as f:
+        barrido = json.load(f)
+    barrido["configuraciones"] = barrido.get("configuraciones", []) + expandir_grilla(barrido.get("grilla", {}))
+    return barrido
+
+def nombre_configuracion(configuracion):
+    return "_".join(f"{ABREVIATURAS.get(clave, clave)}{valor}" for clave, valor in configuracion.items())
+
+# Solo los parámetros que el algoritmo acepta (tamano_archivo no aplica a NSGA-II): así dos
+# configuraciones que difieren en un parámetro ajeno comparten los trabajos de ese algoritmo
+def parametros_algoritmo(algoritmo, configuracion):
+    aceptados = inspect.signature(ALGORITMOS[algoritmo][0]).parameters
+    return {clave: valor for clave, valor in configuracion.items() if clave in aceptados}
+
+# Devuelve la lista de trabajos sin repetir y, por configuración, los trabajos que le corresponden
+def generar_trabajos_barrido(instancias, algoritmos, configuraciones, repeticiones=5, semilla_base=42):
+    trabajos = {}
+    por_configuracion = {}
+    for configuracion in configuraciones:
+        nombre_config = nombre_configuracion(configuracion)
+        for nombre, path in instancias.items():
+            for algoritmo in algoritmos:
+                parametros = parametros_algoritmo(algoritmo, configuracion)
+                for i in range(repeticiones):
+                    trabajo = (nombre, path, algoritmo, semilla_base + i, parametros)
+                    huella = huella_trabajo(trabajo)
+                    trabajos.setdefault(huella, trabajo)
+                    por_configuracion.setdefault(nombre_config, (configuracion, []))[1].append(huella)
+    return list(trabajos.values()), por_configuracion
+
+
+#Paso 2: Ejecución (solo los trabajos que no están en el almacén)
+def ejecutar_barrido(trabajos, directorio_salida, procesos=None):
+    almacen = os.path.join(directorio_salida, "almacen")
+    guardados = sum(os.path.exists(ruta_resultado(almacen, trabajo)) for trabajo in trabajos)
+    print(f"{len(trabajos)} trabajos: {guardados} ya en el almacén, {len(trabajos) - guardados} por ejecutar")
+    resultados = {}
+    for resultado in ejecutar_en_paralelo(trabajos, procesos, almacen):
+        resultados[huella_trabajo(resultado[0])] = resultado
+    return resultados
+
+
+#Paso 3: Tabla consolidada y carpetas por configuración
+def escribir_csv(ruta, campos, filas):
+    with open(ruta, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=campos)
+        writer.writeheader()
+        for fila in filas:
+            writer.writerow(fila)
+
+def guardar_frente_csv(frente, ruta):
+    with open(ruta, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Objetivo 1", "Objetivo 2"])
+        for costo in frente:
+            writer.writerow(costo)
+
+def guardar_parametros(configuracion, ruta):
+    with open(ruta, "w") as f:
+        json.dump(configuracion, f, indent=2)
+
+# Las métricas de cada instancia se calculan contra un único Ytrue armado con todos los frentes del
+# barrido (todas las configuraciones, algoritmos y semillas) y un mismo punto de referencia del
+# hipervolumen, de modo que las configuraciones sean comparables entre sí
+# Los archivos se escriben en segundo plano (salida.EscritorSalida) mientras se calculan las métricas;
+# además, frentes_<instancia>.npz guarda todos los frentes del barrido con sus rutas
+def consolidar(resultados, por_configuracion, directorio_salida, archivo="resultados_barrido.csv"):
+    with EscritorSalida() as escritor:
+        return _consolidar(resultados, por_configuracion, directorio_salida, archivo, escritor)
+
+def _consolidar(resultados, por_configuracion, directorio_salida, archivo, escritor):
+    metricas = {}
+    for instancia in sorted({trabajo[0] for trabajo, *_ in resultados.values()}):
+        huellas = [h for h, (trabajo, *_) in resultados.items() if trabajo[0] == instancia]
+        escritor.enviar(guardar_frentes_npz, os.path.join(directorio_salida, f"frentes_{instancia}.npz"),
+                        [resultados[h] for h in sorted(huellas, key=lambda h: (*resultados[h][0][2:4], h))])
+        frentes = [resultados[h][2] for h in huellas]
+        valores = evaluar_frentes(frentes, construir_frente_Ytrue(frentes))
+        for k, huella in enumerate(huellas):
+            metricas[huella] = {metrica: float(valores[metrica][k]) for metrica in METRICAS}
+
+    filas = []
+    parametros = sorted({clave for configuracion, _ in por_configuracion.values() for clave in configuracion})
+    for nombre_config, (configuracion, huellas) in por_configuracion.items():
+        carpeta = os.path.join(directorio_salida, nombre_config)
+        os.makedirs(carpeta, exist_ok=True)
+        escritor.enviar(guardar_parametros, configuracion, os.path.join(carpeta, "parametros.json"))
+
+        grupos = {}
+        for huella in huellas:
+            trabajo, _, costos_pareto, _ = resultados[huella]
+            grupos.setdefault((trabajo[2], trabajo[0]), []).append((trabajo[3], huella, costos_pareto))
+        filas_config = []
+        for (algoritmo, instancia), corridas in grupos.items():
+            corridas.sort()
+            fila = {"Algoritmo": algoritmo, "Instancia": instancia,
+                    **{m: float(np.mean([metricas[h][m] for _, h, _ in corridas])) for m in METRICAS}}
+            filas_config.append(fila)
+            filas.append({"Configuracion": nombre_config, **configuracion, **fila, "Corridas": len(corridas)})
+            # Frente de la primera semilla, como en main.py
+            prefijo = algoritmo.split("-")[0].lower()
+            escritor.enviar(guardar_frente_csv, corridas[0][2],
+                            os.path.join(carpeta, f"frente_{prefijo}_{instancia}.csv"))
+        escritor.enviar(escribir_csv, os.path.join(carpeta, "resultados_metricas.csv"),
+                        ["Algoritmo", "Instancia"] + METRICAS, filas_config)
+
+    ruta = os.path.join(directorio_salida, archivo)
+    campos = ["Configuracion"] + parametros + ["Algoritmo", "Instancia"] + METRICAS + ["Corridas"]
+    escritor.enviar(escribir_csv, ruta, campos, filas)
+    return ruta
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Barrido de parámetros de NSGA-II / SPEA")
+    parser.add_argument("--config", help="JSON con 'grilla' y/o 'configuraciones' (y opcionalmente instancias, "
+                                         "algoritmos, repeticiones, semilla_base)")
+    parser.add_argument("--tam-poblacion", type=int, nargs="+")
+    parser.add_argument("--generaciones", type=int, nargs="+")
+    parser.add_argument("--prob-mutacion", type=float, nargs="+")
+    parser.add_argument("--tamano-archivo", type=int, nargs="+")
+    parser.add_argument("--algoritmos", nargs="+", choices=list(ALGORITMOS))
+    parser.add_argument("--repeticiones", type=int)
+    parser.add_argument("--semilla-base", type=int)
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--salida", default="barrido", help="Directorio de resultados (incluye el almacén)")
+    args = parser.parse_args()
+
+    barrido = leer_barrido(args.config) if args.config else {"configuraciones": []}
+    grilla = {clave: valores for clave, valores in (("tam_poblacion", args.tam_poblacion),
+                                                   ("generaciones", args.generaciones),
+                                                   ("prob_mutacion", args.prob_mutacion),
+                                                   ("tamano_archivo", args.tamano_archivo)) if valores}
+    if grilla:
+        barrido["configuraciones"] += expandir_grilla(grilla)
+    if not barrido["configuraciones"]:
+        parser.error("no hay configuraciones: use --config o indique valores de parámetros")
+
+    trabajos, por_configuracion = generar_trabajos_barrido(
+        barrido.get("instancias", INSTANCIAS),
+        args.algoritmos or barrido.get("algoritmos", list(ALGORITMOS)),
+        barrido["configuraciones"],
+        args.repeticiones or barrido.get("repeticiones", 5),
+        args.semilla_base if args.semilla_base is not None else barrido.get("semilla_base", 42))
+    resultados = ejecutar_barrido(trabajos, args.salida, args.procesos)
+    print(f"✅ Resultados guardados en '{consolidar(resultados, por_configuracion, args.salida)}'")
@@ -0,0 +1,237 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from utils import (
+    cargar_instancia,
+    InstanciaCoordenadas,
+    evaluar_poblacion,
+    generar_poblacion_inicial,
+    calcular_frentes,
+    crossover_OX,
+    crossover_OX_lote,
+    seleccion_torneo_lote,
+)
+from TSP_bi_Objetivo import (nsga2, spea, distancia_hacinamiento, distancias_hacinamiento, rangos,
+                             calcular_fitness_spea2, calcular_strengths)
+from metricas import evaluar_M1, evaluar_frentes, hipervolumen, punto_referencia
+from cache_rutas import huellas_rutas
+
+
+# Benchmarks de las funciones críticas y de generaciones completas de NSGA-II y SPEA
+# Uso:
+#   python benchmark.py --salida linea_base.json
+#   python benchmark.py --comparar linea_base.json      (marca regresiones y sale con código 1)
+# Funciona sin conexión: usa las instancias KROAB100/KROAC100 incluidas y otras generadas al azar.
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+INSTANCIAS_INCLUIDAS = {
+    "KROAB100": os.path.join(DIRECTORIO, "tsp_KROAB100.TSP.TXT"),
+    "KROAC100": os.path.join(DIRECTORIO, "tsp_kroac100.tsp.txt"),
+}
+
+# Hasta este tamaño la instancia sintética se materializa como matrices (2, n, n);
+# por encima se usan coordenadas con distancias a demanda
+MAX_CIUDADES_MATRIZ = 2000
+
+
+#Paso 1: Instancias sintéticas
+def instancia_sintetica(num_ciudades, semilla=0):
+    coordenadas = np.random.default_rng(semilla).random((2, num_ciudades, 2)) * 4000
+    instancia = InstanciaCoordenadas(coordenadas)
+    if num_ciudades <= MAX_CIUDADES_MATRIZ:
+        todas = np.arange(num_ciudades)
+        return instancia[:, todas[:, np.newaxis], todas[np.newaxis, :]]
+    return instancia
+
+
+#Paso 2: Medición
+# Mejor tiempo de varias repeticiones (menos sensible al ruido) y memoria pico de una ejecución aparte
+def medir(funcion, repeticiones=3):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    tracemalloc.start()
+    funcion()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(tiempos), pico / 2**20
+
+
+# Casos que dependen solo de la población: costos de rutas al azar de una instancia
+def casos_poblacion(matrices, instancia, tam_poblacion, tamano_archivo):
+    num_ciudades = matrices.shape[1]
+    rng = random.Random(0)
+    poblacion = generar_poblacion_inicial(num_ciudades, tam_poblacion, rng)
+    costos = evaluar_poblacion(poblacion, matrices)
+    # NSGA-II ordena padres + hijos; SPEA trabaja sobre población + archivo
+    union = np.concatenate([costos, evaluar_poblacion(generar_poblacion_inicial(num_ciudades, tam_poblacion, rng), matrices)])
+    union_spea = union[:tam_poblacion + tamano_archivo]
+    frentes = calcular_frentes(union)
+    ranks = rangos(frentes, len(union))
+    distancias = distancias_hacinamiento(union, ranks)
+    generador = np.random.default_rng(0)
+    # Tercer objetivo sintético para medir el ordenamiento con más de 2 objetivos (ENS-BS)
+    union_3 = np.column_stack([union, np.random.default_rng(1).permutation(union[:, 0])])
+    ytrue = [tuple(c) for c in union[frentes[0]]]
+    lista = [tuple(c) for c in costos]
+    referencia = punto_referencia([lista])
+    base = {"instancia": instancia, "ciudades": num_ciudades, "poblacion": tam_poblacion}
+    return [
+        ({**base, "caso": "calcular_frentes"}, lambda: calcular_frentes(union), None),
+        ({**base, "caso": "calcular_frentes_3obj"}, lambda: calcular_frentes(union_3), None),
+        ({**base, "caso": "distancia_hacinamiento"},
+         lambda: [distancia_hacinamiento(union, frente) for frente in frentes], None),
+        ({**base, "caso": "distancias_hacinamiento"}, lambda: distancias_hacinamiento(union, ranks), None),
+        ({**base, "caso": "seleccion_torneo_lote"},
+         lambda: seleccion_torneo_lote(ranks, distancias, tam_poblacion, generador), None),
+        ({**base, "caso": "huellas_rutas"}, lambda: huellas_rutas(poblacion), None),
+        ({**base, "archivo": tamano_archivo, "caso": "calcular_strengths"}, lambda: calcular_strengths(union_spea), None),
+        ({**base, "archivo": tamano_archivo, "caso": "calcular_fitness_spea2"}, lambda: calcular_fitness_spea2(union_spea), None),
+        ({**base, "caso": "evaluar_M1"}, lambda: evaluar_M1(lista, ytrue), None),
+        ({**base, "caso": "hipervolumen"}, lambda: hipervolumen(lista, referencia), None),
+        ({**base, "caso": "evaluar_frentes"}, lambda: evaluar_frentes([lista] * 5, ytrue), None),
+    ]
+
+# Casos que dependen del tamaño de la instancia
+def casos_instancia(matrices, instancia, tam_poblacion, tamano_archivo, generaciones):
+    num_ciudades = matrices.shape[1]
+    rng = random.Random(0)
+    poblacion = generar_poblacion_inicial(num_ciudades, tam_poblacion, rng)
+    padres = np.array(poblacion)
+    cortes = np.sort(np.array([rng.sample(range(num_ciudades), 2) for _ in range(tam_poblacion)]), axis=1)
+    base = {"instancia": instancia, "ciudades": num_ciudades, "poblacion": tam_poblacion}
+
+    def generaciones_nsga2():
+        nsga2(num_ciudades, matrices, None, tam_poblacion, generaciones, rng=random.Random(1), estadisticas=contador)
+
+    def generaciones_spea():
+        spea(num_ciudades, matrices, None, tam_poblacion, tamano_archivo, generaciones,
+             rng=random.Random(1), estadisticas=contador)
+
+    contador = {}
+    return [
+        ({**base, "caso": "evaluar_poblacion"}, lambda: evaluar_poblacion(padres, matrices), tam_poblacion),
+        ({**base, "caso": "crossover_OX"},
+         lambda: [crossover_OX(poblacion[i], poblacion[-1 - i], rng) for i in range(tam_poblacion)], None),
+        ({**base, "caso": "crossover_OX_lote"},
+         lambda: crossover_OX_lote(padres, padres[::-1], cortes[:, 0], cortes[:, 1]), None),
+        ({**base, "generaciones": generaciones, "caso": "nsga2_generacion"}, generaciones_nsga2, contador),
+        ({**base, "archivo": tamano_archivo, "generaciones": generaciones, "caso": "spea_generacion"},
+         generaciones_spea, contador),
+    ]
+
+
+# Ejecuta un caso y arma su registro; evaluaciones puede ser un número fijo por llamada
+# o el diccionario de estadísticas que llena el algoritmo
+def ejecutar_caso(clave, funcion, evaluaciones, repeticiones):
+    if isinstance(evaluaciones, dict):
+        evaluaciones.clear()
+    segundos, memoria = medir(funcion, repeticiones)
+    registro = {**clave, "segundos": segundos, "memoria_pico_mb": memoria}
+    if isinstance(evaluaciones, dict):
+        # El diccionario acumula todas las llamadas (repeticiones + la de memoria)
+        por_llamada = evaluaciones.get("evaluaciones", 0) / (repeticiones + 1)
+        registro["evaluaciones_por_segundo"] = por_llamada / segundos
+        registro["segundos_por_generacion"] = segundos / clave["generaciones"]
+    elif evaluaciones:
+        registro["evaluaciones_por_segundo"] = evaluaciones / segundos
+    return registro
+
+
+def ejecutar_benchmarks(ciudades, poblaciones, archivos, generaciones=3, repeticiones=3, incluidas=True):
+    instancias = []
+    if incluidas:
+        for nombre, path in INSTANCIAS_INCLUIDAS.items():
+            instancias.append((nombre, cargar_instancia(path)[1]))
+    for n in ciudades:
+        instancias.append((f"sintetica{n}", instancia_sintetica(n)))
+
+    resultados = []
+    for nombre, matrices in instancias:
+        for tam_poblacion in poblaciones:
+            for k, tamano_archivo in enumerate(archivos):
+                casos = (casos_instancia(matrices, nombre, tam_poblacion, tamano_archivo, generaciones)
+                         + casos_poblacion(matrices, nombre, tam_poblacion, tamano_archivo))
+                # Los casos que no usan archivo se miden solo con el primer tamaño de archivo
+                casos = [caso for caso in casos if k == 0 or "archivo" in caso[0]]
+                for clave, funcion, evaluaciones in casos:
+                    registro = ejecutar_caso(clave, funcion, evaluaciones, repeticiones)
+                    print(f"{registro['caso']:<24} {nombre:<14} pob={tam_poblacion:<4} "
+                          f"{registro['segundos']*1000:10.3f} ms  {registro['memoria_pico_mb']:8.2f} MB")
+                    resultados.append(registro)
+    return resultados
+
+
+#Paso 3: Línea base y comparación
+def clave_resultado(registro):
+    return tuple((k, registro.get(k)) for k in ("caso", "instancia", "ciudades", "poblacion", "archivo", "generaciones"))
+
+def guardar_resultados(resultados, ruta):
+    datos = {
+        "entorno": {
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "plataforma": platform.platform(),
+            "procesador": platform.processor(),
+            "nucleos": os.cpu_count(),
+        },
+        "resultados": resultados,
+    }
+    with open(ruta, "w") as f:
+        json.dump(datos, f, indent=2)
+
+# Resultados de una ejecución anterior, indexados por caso
+def cargar_linea_base(ruta):
+    with open(ruta) as f:
+        return {clave_resultado(r): r for r in json.load(f)["resultados"]}
+
+# Devuelve la lista de casos cuyo tiempo empeoró más que la tolerancia relativa
+# base: resultado de cargar_linea_base (se lee antes de guardar, por si --salida es el mismo archivo)
+def comparar(resultados, base, tolerancia=0.2):
+    regresiones = []
+    for registro in resultados:
+        anterior = base.get(clave_resultado(registro))
+        if anterior is None:
+            continue
+        cambio = registro["segundos"] / anterior["segundos"] - 1
+        marca = "REGRESIÓN" if cambio > tolerancia else ""
+        print(f"{registro['caso']:<24} {registro['instancia']:<14} pob={registro['poblacion']:<4} "
+              f"{anterior['segundos']*1000:10.3f} -> {registro['segundos']*1000:10.3f} ms ({cambio:+.1%}) {marca}")
+        if marca:
+            regresiones.append(registro)
+    return regresiones
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks de NSGA-II / SPEA para TSP bi-objetivo")
+    parser.add_argument("--ciudades", type=int, nargs="*", default=[100, 500, 1000, 5000])
+    parser.add_argument("--poblaciones", type=int, nargs="+", default=[50, 150])
+    parser.add_argument("--archivos", type=int, nargs="+", default=[75])
+    parser.add_argument("--generaciones", type=int, default=3, help="Generaciones por medición de nsga2/spea")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--sin-incluidas", action="store_true", help="No medir KROAB100/KROAC100")
+    parser.add_argument("--salida", default="benchmark.json", help="Archivo JSON con los resultados")
+    parser.add_argument("--comparar", metavar="LINEA_BASE", help="JSON de una ejecución anterior")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Empeoramiento relativo tolerado")
+    args = parser.parse_args()
+
+    base = cargar_linea_base(args.comparar) if args.comparar else None
+    resultados = ejecutar_benchmarks(args.ciudades, args.poblaciones, args.archivos,
+                                     args.generaciones, args.repeticiones, not args.sin_incluidas)
+    guardar_resultados(resultados, args.salida)
+    print(f"Resultados guardados en '{args.salida}'")
+    if base is not None:
+        regresiones = comparar(resultados, base, args.tolerancia)
+        if regresiones:
+            print(f"{len(regresiones)} regresiones por encima de {args.tolerancia:.0%}")
+            sys.exit(1)
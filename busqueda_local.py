@@ -0,0 +1,189 @@
+import time
+import random
+
+import numpy as np
+
+
+# Búsqueda local (etapa memética) para la descendencia de NSGA-II y SPEA
+# Movimientos 2-opt y Or-opt restringidos a listas de candidatos (los k vecinos más cercanos
+# de cada ciudad en cada objetivo). El costo de cada movimiento se obtiene en O(1) a partir de
+# las aristas que cambian, sin reevaluar la ruta. Se asume que las matrices son simétricas,
+# como en las instancias KROA/KROB/KROC.
+
+# Opciones por defecto (se pueden sobrescribir con el parámetro busqueda_local de nsga2/spea)
+OPCIONES_BUSQUEDA_LOCAL = {
+    "k": 8,                    # vecinos candidatos por ciudad y por objetivo
+    "max_movimientos": 20000,  # movimientos evaluados por generación
+    "tiempo_max": None,        # segundos por generación (None = sin límite)
+    "modo": "escalar",         # "escalar" (suma ponderada al azar) o "pareto" (solo movimientos que dominan)
+    "largo_or": 3,             # largo máximo del segmento que mueve Or-opt
+}
+
+# Tolerancia para considerar que un movimiento mejora (evita ciclos por redondeo)
+EPSILON = 1e-7
+
+
+#Paso 1: Listas de candidatos
+# Devuelve un arreglo (n, objetivos * k) con los k vecinos más cercanos de cada ciudad en cada objetivo
+# Las distancias se calculan por bloques de filas: la memoria usada no crece con n²
+# (sirve también para InstanciaCoordenadas, que calcula las aristas a demanda)
+def listas_candidatas(matrices, k=8):
+    objetivos, n, _ = matrices.shape
+    k = min(k, n - 1)
+    bloque = max(1, 2_000_000 // (n * objetivos))
+    todas = np.arange(n)
+    candidatos = np.empty((n, objetivos * k), dtype=np.intp)
+    for inicio in range(0, n, bloque):
+        filas = todas[inicio:inicio + bloque]
+        distancias = np.array(matrices[:, filas[:, np.newaxis], todas[np.newaxis, :]], dtype=float)
+        distancias[:, np.arange(len(filas)), filas] = np.inf  # una ciudad no es candidata de sí misma
+        cercanos = np.argpartition(distancias, k - 1, axis=2)[:, :, :k]
+        # Ordenamos los k elegidos del más cercano al más lejano
+        orden = np.argsort(np.take_along_axis(distancias, cercanos, axis=2), axis=2)
+        cercanos = np.take_along_axis(cercanos, orden, axis=2)
+        candidatos[filas] = cercanos.transpose(1, 0, 2).reshape(len(filas), -1)
+    return candidatos
+
+
+#Paso 2: Búsqueda local sobre la descendencia
+class BusquedaLocal:
+    def __init__(self, matrices, k=8, max_movimientos=20000, tiempo_max=None, modo="escalar",
+                 largo_or=3, estadisticas=None):
+        if modo not in ("escalar", "pareto"):
+            raise ValueError(f"Modo de búsqueda local desconocido: {modo}")
+        self.matrices = matrices
+        self.candidatos = listas_candidatas(matrices, k)
+        self.max_movimientos = max_movimientos
+        self.tiempo_max = tiempo_max
+        self.modo = modo
+        self.largo_or = largo_or
+        self.estadisticas = estadisticas
+        self.reiniciar_presupuesto()
+
+    # Presupuesto de movimientos y tiempo compartido por las llamadas a mejorar_ruta hasta el próximo reinicio
+    # (mejorar_poblacion lo reinicia en cada generación)
+    def reiniciar_presupuesto(self):
+        self._restantes = self.max_movimientos
+        self._limite = None if self.tiempo_max is None else time.perf_counter() + self.tiempo_max
+
+    # Mejora cada hijo con pesos al azar hasta agotar el presupuesto de la generación
+    def mejorar_poblacion(self, poblacion, costos, rng=None):
+        rng = random if rng is None else rng
+        self.reiniciar_presupuesto()
+        costos = np.array(costos, dtype=float)
+        poblacion = list(poblacion)
+        for i in rng.sample(range(len(poblacion)), len(poblacion)):
+            if not self._queda_presupuesto():
+                break
+            pesos = self._pesos_al_azar(rng)
+            poblacion[i], costos[i] = self.mejorar_ruta(poblacion[i], costos[i], pesos, rng)
+        return poblacion, costos
+
+    # Pesos al azar que suman 1: con 2 objetivos w y 1 - w (w en [0.01, 0.99]); con más, uniformes
+    # sobre el símplex (exponenciales normalizadas), con un mínimo para que ningún objetivo quede fuera
+    def _pesos_al_azar(self, rng):
+        objetivos = self.matrices.shape[0]
+        if objetivos == 2:
+            w = min(max(rng.random(), 0.01), 0.99)
+            return np.array([w, 1 - w])
+        pesos = np.array([rng.expovariate(1.0) for _ in range(objetivos)])
+        pesos = np.maximum(pesos / pesos.sum(), 0.01)
+        return pesos / pesos.sum()
+
+    # Primera mejora sobre las ciudades en orden aleatorio, hasta que una pasada completa no mejore
+    def mejorar_ruta(self, ruta, costo, pesos, rng=None):
+        rng = random if rng is None else rng
+        self._ruta = np.array(ruta, dtype=np.intp)
+        self._posicion = np.empty_like(self._ruta)
+        self._posicion[self._ruta] = np.arange(len(self._ruta))
+        costo = np.array(costo, dtype=float)
+        mejoro = True
+        while mejoro and self._queda_presupuesto():
+            mejoro = False
+            for a in rng.sample(range(len(self._ruta)), len(self._ruta)):
+                if not self._queda_presupuesto():
+                    break
+                for movimiento in (self._dos_opt, self._or_opt):
+                    delta = movimiento(a, pesos)
+                    if delta is not None:
+                        costo += delta
+                        mejoro = True
+        return self._ruta.tolist(), costo
+
+    def _queda_presupuesto(self):
+        if self._restantes <= 0:
+            return False
+        return self._limite is None or time.perf_counter() < self._limite
+
+    # Índice del mejor movimiento aceptable entre las columnas de deltas (objetivos, m), o None
+    def _elegir(self, deltas, pesos, validos):
+        self._restantes -= deltas.shape[1]
+        if self.estadisticas is not None:
+            self.estadisticas["movimientos_evaluados"] = self.estadisticas.get("movimientos_evaluados", 0) + deltas.shape[1]
+        if self.modo == "pareto":
+            validos = validos & (deltas <= 0).all(axis=0) & (deltas < 0).any(axis=0)
+        valor = np.where(validos, pesos @ deltas, np.inf)
+        mejor = int(np.argmin(valor))
+        return mejor if valor[mejor] < -EPSILON else None
+
+    def _contar_aplicado(self):
+        if self.estadisticas is not None:
+            self.estadisticas["movimientos_aplicados"] = self.estadisticas.get("movimientos_aplicados", 0) + 1
+
+    # 2-opt: reemplaza las aristas (a, b) y (c, d) por (a, c) y (b, d), con c candidato de a
+    def _dos_opt(self, a, pesos):
+        ruta, posicion, M = self._ruta, self._posicion, self.matrices
+        n = len(ruta)
+        i = posicion[a]
+        b = ruta[(i + 1) % n]
+        c = self.candidatos[a]
+        d = ruta[(posicion[c] + 1) % n]
+        validos = (c != b) & (d != a)
+        deltas = M[:, a, c] + M[:, b, d] - M[:, a, b][:, np.newaxis] - M[:, c, d]
+        mejor = self._elegir(deltas, pesos, validos)
+        if mejor is None:
+            return None
+
+        # Invertimos el tramo b..c (o el complementario d..a, que da el mismo ciclo)
+        j = posicion[c[mejor]]
+        desde, hasta = (i + 1, j) if i < j else (j + 1, i)
+        ruta[desde:hasta + 1] = ruta[desde:hasta + 1][::-1].copy()
+        posicion[ruta[desde:hasta + 1]] = np.arange(desde, hasta + 1)
+        self._contar_aplicado()
+        return deltas[:, mejor]
+
+    # Or-opt: mueve el segmento de largo 1..largo_or que empieza en a junto a un candidato de a,
+    # en cualquiera de los dos sentidos
+    def _or_opt(self, a, pesos):
+        ruta, posicion, M = self._ruta, self._posicion, self.matrices
+        n = len(ruta)
+        i = posicion[a]
+        for largo in range(1, min(self.largo_or, n - 3) + 1):
+            segmento = ruta[(i + np.arange(largo)) % n]
+            s0, sL = segmento[0], segmento[-1]
+            p, nx = ruta[(i - 1) % n], ruta[(i + largo) % n]
+            ahorro = M[:, p, nx] - M[:, p, s0] - M[:, sL, nx]
+
+            # Aristas (u, v) donde insertar: las que salen y las que llegan a cada candidato
+            c = self.candidatos[a]
+            u = np.concatenate([c, ruta[(posicion[c] - 1) % n]])
+            v = np.concatenate([ruta[(posicion[c] + 1) % n], c])
+            validos = ~(np.isin(u, segmento) | np.isin(v, segmento))
+            base = ahorro[:, np.newaxis] - M[:, u, v]
+            directo = base + M[:, u, s0] + M[:, sL, v]
+            invertido = base + M[:, u, sL] + M[:, s0, v]
+            deltas = np.concatenate([directo, invertido], axis=1)
+            mejor = self._elegir(deltas, pesos, np.concatenate([validos, validos]))
+            if mejor is None:
+                continue
+
+            invertir = mejor >= len(u)
+            destino = u[mejor % len(u)]
+            resto = np.delete(ruta, (i + np.arange(largo)) % n)
+            donde = int(np.flatnonzero(resto == destino)[0]) + 1
+            nueva = np.concatenate([resto[:donde], segmento[::-1] if invertir else segmento, resto[donde:]])
+            ruta[:] = nueva
+            posicion[ruta] = np.arange(n)
+            self._contar_aplicado()
+            return deltas[:, mejor]
+        return None
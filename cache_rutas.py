@@ -0,0 +1,130 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+from poblacion import tipo_rutas
+from utils import evaluar_poblacion
+
+
+# Rutas repetidas: huella canónica, caché de costos y eliminación de duplicados
+# Un ciclo es la misma solución empiece en la ciudad que empiece y se recorra en el sentido que sea
+# (se asume que las matrices son simétricas, como en las instancias KROA/KROB/KROC), así que la huella
+# se calcula sobre una forma canónica: rotada para empezar en la ciudad 0 y en el sentido en que la
+# segunda ciudad es la menor de sus dos vecinas.
+
+# Opciones por defecto (se pueden sobrescribir con el parámetro duplicados de nsga2/spea)
+OPCIONES_DUPLICADOS = {
+    "capacidad_cache": 10000,  # costos guardados en la caché LRU (None o 0 = sin caché)
+    "eliminar": True,          # descartar rutas repetidas antes de la supervivencia
+}
+
+
+#Paso 1: Forma canónica y huella
+# rutas: arreglo (pop, n) o una sola ruta; devuelve un arreglo (pop, n) con la forma canónica de cada una
+def formas_canonicas(rutas):
+    rutas = np.asarray(rutas)
+    if rutas.ndim == 1:
+        rutas = rutas[np.newaxis, :]
+    n = rutas.shape[1]
+    inicio = np.argmax(rutas == 0, axis=1)
+    canonicas = np.take_along_axis(rutas, (inicio[:, np.newaxis] + np.arange(n)) % n, axis=1)
+    if n > 2:
+        invertir = canonicas[:, 1] > canonicas[:, -1]
+        canonicas[invertir, 1:] = canonicas[invertir, :0:-1]
+    return canonicas
+
+# Huella (16 bytes) de cada ruta, igual para todas las rotaciones y ambos sentidos de un mismo ciclo
+# Se normaliza el tipo de enteros para que la huella no dependa de cómo llegó la ruta (lista o bloque)
+def huellas_rutas(rutas):
+    canonicas = formas_canonicas(rutas)
+    canonicas = np.ascontiguousarray(canonicas, dtype=tipo_rutas(canonicas.shape[1]))
+    return [hashlib.blake2b(fila.tobytes(), digest_size=16).digest() for fila in canonicas]
+
+# Índices de la primera aparición de cada ruta distinta y de las repeticiones, ambos en orden ascendente
+def indices_distintos(rutas):
+    vistas = set()
+    distintos, repetidos = [], []
+    for i, huella in enumerate(huellas_rutas(rutas)):
+        if huella in vistas:
+            repetidos.append(i)
+        else:
+            vistas.add(huella)
+            distintos.append(i)
+    return np.array(distintos, dtype=np.intp), np.array(repetidos, dtype=np.intp)
+
+
+#Paso 2: Caché de costos
+# Caché LRU de costos indexada por la huella canónica: una ruta ya evaluada (en cualquier rotación
+# o sentido) no se vuelve a evaluar. Solo las evaluaciones reales cuentan en estadisticas["evaluaciones"];
+# los aciertos y fallos se acumulan en estadisticas["cache_aciertos"] y estadisticas["cache_fallos"]
+class CacheCostos:
+    def __init__(self, capacidad=10000):
+        self.capacidad = capacidad
+        self.aciertos = 0
+        self.fallos = 0
+        self._costos = OrderedDict()
+
+    def __len__(self):
+        return len(self._costos)
+
+    @property
+    def tasa_aciertos(self):
+        consultas = self.aciertos + self.fallos
+        return self.aciertos / consultas if consultas else 0.0
+
+    # Mismo contrato que utils.evaluar_poblacion: devuelve un arreglo (pop, objetivos) con los costos
+    # Las rutas repetidas dentro del mismo bloque se evalúan una sola vez
+    def evaluar(self, poblacion, matrices, estadisticas=None):
+        rutas = np.asarray(poblacion)
+        if rutas.ndim == 1:
+            rutas = rutas[np.newaxis, :]
+        huellas = huellas_rutas(rutas)
+        encontrados, faltantes = {}, {}  # huella -> costo / huella -> primera fila del bloque
+        for i, huella in enumerate(huellas):
+            if huella in self._costos:
+                self._costos.move_to_end(huella)
+                encontrados[huella] = self._costos[huella]
+            elif huella not in faltantes:
+                faltantes[huella] = i
+        if faltantes:
+            nuevos = evaluar_poblacion(rutas[list(faltantes.values())], matrices, estadisticas)
+            for huella, costo in zip(faltantes, nuevos):
+                encontrados[huella] = costo
+                self._guardar(huella, costo)
+
+        aciertos = len(huellas) - len(faltantes)
+        self.aciertos += aciertos
+        self.fallos += len(faltantes)
+        if estadisticas is not None:
+            estadisticas["cache_aciertos"] = estadisticas.get("cache_aciertos", 0) + aciertos
+            estadisticas["cache_fallos"] = estadisticas.get("cache_fallos", 0) + len(faltantes)
+        return np.array([encontrados[huella] for huella in huellas])
+
+    def _guardar(self, huella, costo):
+        self._costos[huella] = costo
+        if len(self._costos) > self.capacidad:
+            self._costos.popitem(last=False)  # la menos usada recientemente
+
+
+#Paso 3: Eliminación de duplicados
+# Deja en la población (padres + hijos, o archivo + hijos) una sola copia de cada ruta, conservando el
+# orden; si quedan menos de `minimo` rutas distintas, se mantienen las primeras repeticiones
+# necesarias para completar ese tamaño. Devuelve la cantidad de rutas descartadas
+def descartar_duplicados(poblacion, minimo, estadisticas=None):
+    distintos, repetidos = indices_distintos(poblacion.rutas)
+    descartados = len(repetidos) - max(0, minimo - len(distintos))
+    if descartados > 0:
+        poblacion.conservar(np.sort(np.concatenate([distintos, repetidos[:len(repetidos) - descartados]])))
+        if estadisticas is not None:
+            estadisticas["duplicados_eliminados"] = estadisticas.get("duplicados_eliminados", 0) + descartados
+    return max(descartados, 0)
+
+# Crea la caché y decide la eliminación de duplicados a partir de las opciones recibidas
+# Devuelve (cache o None, eliminar)
+def crear_control_duplicados(opciones):
+    if opciones is None or opciones is False:
+        return None, False
+    opciones = {**OPCIONES_DUPLICADOS, **(opciones if isinstance(opciones, dict) else {})}
+    cache = CacheCostos(opciones["capacidad_cache"]) if opciones["capacidad_cache"] else None
+    return cache, opciones["eliminar"]
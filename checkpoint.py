@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import pickle
+
+import numpy as np
+
+from utils import huella_archivo
+
+
+# Checkpoints de corridas largas y registro de trabajos terminados
+# Un checkpoint guarda todo lo necesario para continuar una corrida en la generación exacta
+# (población, archivo, costos, contador de generación y estado del generador aleatorio),
+# de modo que el resultado sea idéntico al de una corrida sin interrupciones.
+
+# Escribe a un temporal y lo renombra: si el proceso muere a mitad de la escritura,
+# el checkpoint anterior sigue intacto
+def _escribir_atomico(ruta, objeto):
+    carpeta = os.path.dirname(ruta)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok=True)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, "wb") as f:
+        pickle.dump(objeto, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporal, ruta)
+
+def _leer(ruta):
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta, "rb") as f:
+        return pickle.load(f)
+
+# Las rutas se guardan como un único arreglo de enteros (pop, n): mucho más compacto que listas
+def _rutas_a_arreglo(rutas):
+    rutas = np.asarray(rutas)
+    return rutas.astype(np.uint16 if rutas.size and rutas.max() < 2**16 else np.int32)
+
+
+#Paso 1: Guardar y restaurar el estado de una corrida
+# estado: diccionario con "gen", "rng" y listas de rutas/arreglos de costos; config identifica la corrida
+# generador: numpy.random.Generator de la corrida, si la usa (se guarda el estado de su bit_generator)
+def guardar_checkpoint(ruta, config, estado, rng, generador=None):
+    datos = {"config": config, "rng": rng.getstate()}
+    if generador is not None:
+        datos["generador"] = generador.bit_generator.state
+    for clave, valor in estado.items():
+        if clave in ("poblacion", "archivo"):
+            valor = _rutas_a_arreglo(valor) if len(valor) else np.empty((0, 0), dtype=np.int32)
+        datos[clave] = valor
+    _escribir_atomico(ruta, datos)
+
+# Devuelve el estado guardado (con las rutas como listas) o None si no hay checkpoint
+# El estado del generador aleatorio se restaura directamente en rng; si se guardó un generador
+# de NumPy, estado["generador"] es un Generator nuevo en el mismo estado
+def cargar_checkpoint(ruta, config, rng):
+    datos = _leer(ruta)
+    if datos is None:
+        return None
+    if datos["config"] != config:
+        raise ValueError(f"El checkpoint {ruta} corresponde a otra corrida: {datos['config']} != {config}")
+    rng.setstate(datos["rng"])
+    estado = {clave: valor for clave, valor in datos.items() if clave not in ("config", "rng")}
+    if "generador" in estado:
+        bit_generator = getattr(np.random, estado["generador"]["bit_generator"])()
+        bit_generator.state = estado["generador"]
+        estado["generador"] = np.random.Generator(bit_generator)
+    for clave in ("poblacion", "archivo"):
+        if clave in estado:
+            estado[clave] = estado[clave].tolist()
+    return estado
+
+
+#Paso 2: Registro de trabajos (instancia, algoritmo, semilla) terminados
+# Un trabajo puede traer un quinto elemento con parámetros propios (barridos de parámetros):
+# en ese caso el nombre incluye la huella del trabajo completo
+def nombre_trabajo(trabajo):
+    nombre, _, algoritmo, semilla = trabajo[:4]
+    if len(trabajo) > 4:
+        return f"{nombre}_{algoritmo}_{semilla}_{huella_trabajo(trabajo)}"
+    return f"{nombre}_{algoritmo}_{semilla}"
+
+# Hash de (contenido de la instancia, algoritmo, parámetros, semilla): dos trabajos con la misma huella
+# producen el mismo resultado, así que uno ya guardado se puede reutilizar
+def huella_trabajo(trabajo):
+    _, path, algoritmo, semilla = trabajo[:4]
+    parametros = trabajo[4] if len(trabajo) > 4 else {}
+    rutas = path if isinstance(path, (list, tuple)) else [path]
+    datos = json.dumps([[huella_archivo(ruta) for ruta in rutas], algoritmo, semilla, parametros], sort_keys=True)
+    return hashlib.sha1(datos.encode()).hexdigest()[:12]
+
+def ruta_checkpoint(directorio, trabajo):
+    return os.path.join(directorio, nombre_trabajo(trabajo) + ".ckpt")
+
+def ruta_resultado(directorio, trabajo):
+    return os.path.join(directorio, nombre_trabajo(trabajo) + ".resultado")
+
+# Identidad de un resultado: huella del trabajo (contenido de la instancia, algoritmo, semilla y parámetros propios),
+# parámetros efectivos del algoritmo y criterio de parada. Un resultado guardado con otra identidad no se reutiliza
+def identidad_resultado(trabajo, parametros, parada):
+    return {"huella": huella_trabajo(trabajo), "parametros": parametros, "parada": parada}
+
+def guardar_resultado(directorio, trabajo, frente_pareto, costos_pareto, identidad=None, estadisticas=None):
+    _escribir_atomico(ruta_resultado(directorio, trabajo),
+                      {"trabajo": trabajo, "identidad": identidad, "frente": _rutas_a_arreglo(frente_pareto),
+                       "costos": costos_pareto, "estadisticas": estadisticas or {}})
+    # El checkpoint intermedio ya no hace falta
+    if os.path.exists(ruta_checkpoint(directorio, trabajo)):
+        os.remove(ruta_checkpoint(directorio, trabajo))
+
+# Resultado (trabajo, frente_pareto, costos_pareto, estadisticas) de un trabajo ya terminado, o None si no hay
+# o si se guardó con otra identidad (la corrida se repite y lo reemplaza)
+def cargar_resultado(directorio, trabajo, identidad=None):
+    datos = _leer(ruta_resultado(directorio, trabajo))
+    if datos is None or datos.get("identidad") != identidad:
+        return None
+    return trabajo, datos["frente"].tolist(), datos["costos"], datos["estadisticas"]
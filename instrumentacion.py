@@ -0,0 +1,164 @@
+import json
+import os
+import time
+import cProfile
+import tracemalloc
+
+
+# Instrumentación del ciclo generacional: tiempos por fase, contadores y tamaños de frentes
+# Cada generación produce un evento (diccionario) que se entrega a los suscriptores y,
+# opcionalmente, se escribe como una línea JSON en un archivo de telemetría.
+# Sin instrumentación se usa SIN_INSTRUMENTACION, cuyas operaciones no hacen nada.
+
+# Fase medida: se usa como "with instrumentacion.fase('ordenamiento'):"
+class _Fase:
+    __slots__ = ("tiempos", "nombre", "inicio")
+
+    def __init__(self, tiempos, nombre):
+        self.tiempos = tiempos
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excepcion):
+        self.tiempos[self.nombre] = self.tiempos.get(self.nombre, 0.0) + time.perf_counter() - self.inicio
+        return False
+
+
+class Instrumentacion:
+    activa = True
+
+    # archivo_jsonl: ruta del archivo de telemetría (una línea por evento)
+    # perfil: ruta donde guardar las estadísticas de cProfile al finalizar (None = sin perfilar)
+    # memoria: si es True, cada evento incluye la memoria actual y pico medida con tracemalloc
+    # frentes: si es True, cada evento de generación incluye en "frente" los costos del primer frente
+    # (lista de listas; p. ej. para transmitir frentes intermedios, ver servicio.py)
+    def __init__(self, archivo_jsonl=None, perfil=None, memoria=False, frentes=False):
+        self.suscriptores = []
+        self.archivo_jsonl = archivo_jsonl
+        self.perfil = perfil
+        self.memoria = memoria
+        self.frentes = frentes
+        self._archivo = None
+        self._perfilador = None
+        self._tiempos = {}
+        self._contadores = {}
+        self._seguidas = None
+        self._previas = {}
+        self._inicio = None
+        self.totales = {}
+
+    # Registra una función que recibe cada evento (diccionario)
+    def suscribir(self, funcion):
+        self.suscriptores.append(funcion)
+        return funcion
+
+    def fase(self, nombre):
+        return _Fase(self._tiempos, nombre)
+
+    def contar(self, nombre, cantidad=1):
+        self._contadores[nombre] = self._contadores.get(nombre, 0) + cantidad
+
+    # Sigue un diccionario de estadísticas acumuladas (el de nsga2/spea): en cada generación se cuenta
+    # cuánto aumentó cada valor numérico (evaluaciones completas e incrementales, aciertos de caché, ...)
+    def seguir(self, estadisticas):
+        self._seguidas = estadisticas
+        self._previas = dict(estadisticas)
+
+    # Comienzo de una corrida: abre la telemetría y activa los perfiladores pedidos
+    def iniciar(self, **datos):
+        if self.archivo_jsonl and self._archivo is None:
+            carpeta = os.path.dirname(self.archivo_jsonl)
+            if carpeta:
+                os.makedirs(carpeta, exist_ok=True)
+            self._archivo = open(self.archivo_jsonl, "a")
+        if self.memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self.perfil:
+            self._perfilador = cProfile.Profile()
+            self._perfilador.enable()
+        self._inicio = time.perf_counter()
+        self._tiempos.clear()
+        self._contadores.clear()
+        self.totales = {}
+        self._emitir({"evento": "inicio", **datos})
+
+    # Cierre de una generación: emite tiempos, contadores y los datos recibidos, y reinicia los acumuladores
+    def fin_generacion(self, gen, **datos):
+        if self._seguidas is not None:
+            for nombre, valor in self._seguidas.items():
+                anterior = self._previas.get(nombre, 0)
+                if isinstance(valor, (int, float)) and isinstance(anterior, (int, float)) and valor != anterior:
+                    self.contar(nombre, valor - anterior)
+            self._previas = dict(self._seguidas)
+        evento = {"evento": "generacion", "gen": gen, "fases": dict(self._tiempos),
+                  "contadores": dict(self._contadores), **datos}
+        if self.memoria:
+            actual, pico = tracemalloc.get_traced_memory()
+            evento["memoria_mb"] = actual / 2**20
+            evento["memoria_pico_mb"] = pico / 2**20
+        for nombre, valor in self._tiempos.items():
+            self.totales[nombre] = self.totales.get(nombre, 0.0) + valor
+        self._tiempos.clear()
+        self._contadores.clear()
+        self._emitir(evento)
+
+    def finalizar(self, **datos):
+        if self._perfilador is not None:
+            self._perfilador.disable()
+            self._perfilador.dump_stats(self.perfil)
+            self._perfilador = None
+        if self.memoria and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._seguidas = None
+        self._emitir({"evento": "fin", "segundos": time.perf_counter() - self._inicio,
+                      "fases": dict(self.totales), **datos})
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+
+    def _emitir(self, evento):
+        for funcion in self.suscriptores:
+            funcion(evento)
+        if self._archivo is not None:
+            self._archivo.write(json.dumps(evento, default=float) + "\n")
+
+
+# Reemplazo sin costo cuando la instrumentación está desactivada
+class _FaseNula:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        return False
+
+
+class _SinInstrumentacion:
+    activa = False
+    frentes = False
+    _fase = _FaseNula()
+
+    def fase(self, nombre):
+        return self._fase
+
+    def contar(self, nombre, cantidad=1):
+        pass
+
+    def seguir(self, estadisticas):
+        pass
+
+    def iniciar(self, **datos):
+        pass
+
+    def fin_generacion(self, gen, **datos):
+        pass
+
+    def finalizar(self, **datos):
+        pass
+
+
+SIN_INSTRUMENTACION = _SinInstrumentacion()
@@ -0,0 +1,203 @@
+import argparse
+import os
+import random
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from utils import apilar_matrices, cargar_instancia, evaluar_poblacion, generar_poblacion_inicial, crear_generador
+from TSP_bi_Objetivo import generacion_nsga2, clasificar, extraer_frente_pareto, crear_busqueda_local
+from poblacion import Poblacion
+from cache_rutas import crear_control_duplicados
+
+
+# Modelo de islas para NSGA-II: varias subpoblaciones evolucionan en procesos separados y cada
+# intervalo_migracion generaciones envían sus mejores individuos a la isla siguiente (anillo).
+# Los migrantes viajan por un bloque de memoria compartida con dos juegos de casillas (por paridad
+# de la época): cada isla escribe en su casilla, todas esperan en una barrera y luego cada una lee
+# la casilla de la isla anterior. Con la barrera la migración es sincrónica, así que el resultado
+# depende solo de la semilla y de la cantidad de islas, no de cuántos procesos las ejecutan.
+
+
+class Isla:
+    def __init__(self, numero, num_ciudades, matrices, tam_poblacion, prob_mutacion, semilla, busqueda_local=None,
+                 duplicados=None):
+        self.numero = numero
+        self.matrices = matrices
+        self.tam_poblacion = tam_poblacion
+        self.prob_mutacion = prob_mutacion
+        # Cada isla tiene su propio generador, derivado de la semilla de la corrida
+        self.rng = random.Random(f"{semilla}:{numero}")
+        self.generador = crear_generador(self.rng)
+        self.estadisticas = {}
+        self.busqueda = crear_busqueda_local(matrices, busqueda_local, self.estadisticas)
+        self.cache, self.eliminar_duplicados = crear_control_duplicados(duplicados)
+        self.poblacion = Poblacion(2 * tam_poblacion, num_ciudades, matrices.shape[0])
+        rutas = generar_poblacion_inicial(num_ciudades, tam_poblacion, self.rng)
+        evaluar = evaluar_poblacion if self.cache is None else self.cache.evaluar
+        self.poblacion.cargar(rutas, evaluar(rutas, matrices, self.estadisticas))
+        self.ranks, self.distancias = clasificar(self.poblacion)
+
+    def evolucionar(self, generaciones):
+        for _ in range(generaciones):
+            self.ranks, self.distancias, _ = generacion_nsga2(self.poblacion, self.ranks, self.distancias,
+                                                              self.tam_poblacion, self.matrices, self.prob_mutacion,
+                                                              self.rng, self.generador, self.estadisticas,
+                                                              self.busqueda, cache=self.cache,
+                                                              eliminar_duplicados=self.eliminar_duplicados)
+
+    # Individuos de mejor a peor: por rango y, dentro del rango, por mayor hacinamiento
+    def orden(self):
+        return np.lexsort((-self.distancias, self.ranks))
+
+    # Copia los mejores individuos en las casillas de salida
+    def emigrar(self, rutas, costos):
+        orden = self.orden()[:len(rutas)]
+        rutas[:] = self.poblacion.rutas[orden]
+        costos[:] = self.poblacion.costos[orden]
+
+    # Los inmigrantes reemplazan a los peores individuos y llegan con sus costos (sin reevaluar);
+    # luego se recalculan rangos y distancias de la isla
+    def inmigrar(self, rutas, costos):
+        peores = self.orden()[-len(rutas):]
+        self.poblacion.rutas[peores] = rutas
+        self.poblacion.costos[peores] = costos
+        self.ranks, self.distancias = clasificar(self.poblacion)
+
+
+# Reparto de las generaciones en épocas; entre una época y la siguiente hay una migración
+def epocas(generaciones, intervalo_migracion):
+    return [min(intervalo_migracion, generaciones - inicio) for inicio in range(0, generaciones, intervalo_migracion)]
+
+# Vistas (paridad, isla, migrante, ...) de rutas y costos sobre un mismo bloque de memoria
+def vistas_migracion(buffer, islas, migrantes, num_ciudades, num_objetivos=2):
+    forma_rutas, forma_costos = (2, islas, migrantes, num_ciudades), (2, islas, migrantes, num_objetivos)
+    rutas = np.ndarray(forma_rutas, dtype=np.int32, buffer=buffer)
+    costos = np.ndarray(forma_costos, dtype=np.float64, buffer=buffer, offset=rutas.nbytes)
+    return rutas, costos
+
+def bytes_migracion(islas, migrantes, num_ciudades, num_objetivos=2):
+    return 2 * islas * migrantes * (num_ciudades * np.dtype(np.int32).itemsize
+                                    + num_objetivos * np.dtype(np.float64).itemsize)
+
+
+# Ejecuta un grupo de islas (las que le tocan a un proceso) hasta el final de la corrida
+def ejecutar_grupo(numeros, islas, num_ciudades, matrices, parametros, semilla, rutas, costos, barrera=None):
+    grupo = [Isla(numero, num_ciudades, matrices, parametros["tam_poblacion"], parametros["prob_mutacion"], semilla,
+                  parametros["busqueda_local"], parametros["duplicados"]) for numero in numeros]
+    plan = epocas(parametros["generaciones"], parametros["intervalo_migracion"])
+    for epoca, generaciones in enumerate(plan):
+        for isla in grupo:
+            isla.evolucionar(generaciones)
+        if epoca == len(plan) - 1:
+            break
+        paridad = epoca % 2
+        for isla in grupo:
+            isla.emigrar(rutas[paridad, isla.numero], costos[paridad, isla.numero])
+        if barrera is not None:
+            barrera.wait()
+        for isla in grupo:
+            origen = (isla.numero - 1) % islas
+            isla.inmigrar(rutas[paridad, origen], costos[paridad, origen])
+    return [(isla.numero, isla.poblacion.rutas.copy(), isla.poblacion.costos.copy(), isla.estadisticas)
+            for isla in grupo]
+
+
+def _proceso_grupo(numeros, islas, num_ciudades, matrices, parametros, semilla, nombre_memoria, barrera, cola):
+    memoria = shared_memory.SharedMemory(name=nombre_memoria)
+    try:
+        cola.put(ejecutar_grupo(numeros, islas, num_ciudades, matrices, parametros, semilla,
+                                *vistas_migracion(memoria.buf, islas, parametros["migrantes"], num_ciudades,
+                                                  matrices.shape[0]), barrera))
+    except Exception as error:
+        barrera.abort()  # despierta a los demás procesos para que no queden esperando
+        cola.put(error)
+    finally:
+        memoria.close()
+
+
+#Paso 1: NSGA-II con islas
+# tam_poblacion es el tamaño de cada isla; migrantes, la cantidad de individuos que envía cada isla
+# procesos=None usa un proceso por isla (hasta la cantidad de núcleos); procesos=1 ejecuta todo en serie
+# estadisticas: diccionario opcional donde se suman las evaluaciones de todas las islas
+# duplicados: como en nsga2 (cada isla tiene su propia caché de costos)
+def nsga2_islas(num_ciudades, matriz1, matriz2=None, tam_poblacion=150, generaciones=100, prob_mutacion=0.2, semilla=42,
+                islas=4, intervalo_migracion=10, migrantes=5, procesos=None, busqueda_local=None, estadisticas=None,
+                duplicados=None):
+    matrices = apilar_matrices(matriz1, matriz2)
+    migrantes = min(migrantes, tam_poblacion)
+    objetivos = matrices.shape[0]
+    parametros = {"tam_poblacion": tam_poblacion, "generaciones": generaciones, "prob_mutacion": prob_mutacion,
+                  "intervalo_migracion": intervalo_migracion, "migrantes": migrantes, "busqueda_local": busqueda_local,
+                  "duplicados": duplicados}
+    procesos = max(1, min(procesos or os.cpu_count() or 1, islas))
+    # Islas repartidas en forma alternada entre los procesos
+    grupos = [list(range(p, islas, procesos)) for p in range(procesos)]
+
+    if procesos == 1:
+        rutas, costos = vistas_migracion(bytearray(bytes_migracion(islas, migrantes, num_ciudades, objetivos)),
+                                         islas, migrantes, num_ciudades, objetivos)
+        resultados = ejecutar_grupo(grupos[0], islas, num_ciudades, matrices, parametros, semilla, rutas, costos)
+    else:
+        memoria = shared_memory.SharedMemory(create=True,
+                                             size=bytes_migracion(islas, migrantes, num_ciudades, objetivos))
+        contexto = mp.get_context()
+        barrera = contexto.Barrier(procesos)
+        cola = contexto.Queue()
+        trabajadores = [contexto.Process(target=_proceso_grupo,
+                                         args=(grupo, islas, num_ciudades, matrices, parametros, semilla,
+                                               memoria.name, barrera, cola))
+                        for grupo in grupos]
+        try:
+            for trabajador in trabajadores:
+                trabajador.start()
+            resultados, errores = [], []
+            for _ in trabajadores:
+                recibido = cola.get()
+                if isinstance(recibido, Exception):
+                    errores.append(recibido)
+                else:
+                    resultados.extend(recibido)
+            for trabajador in trabajadores:
+                trabajador.join()
+            if errores:
+                raise RuntimeError(f"Falló la ejecución de una isla: {errores[0]!r}") from errores[0]
+        finally:
+            for trabajador in trabajadores:
+                if trabajador.is_alive():
+                    trabajador.terminate()
+            memoria.close()
+            memoria.unlink()
+
+    # Frente final: no dominados de la unión de todas las islas (en orden de isla, para ser reproducible)
+    resultados.sort(key=lambda r: r[0])
+    poblacion = np.concatenate([rutas_isla for _, rutas_isla, _, _ in resultados])
+    costos = np.concatenate([costos_isla for _, _, costos_isla, _ in resultados])
+    if estadisticas is not None:
+        for _, _, _, estadisticas_isla in resultados:
+            for clave, valor in estadisticas_isla.items():
+                estadisticas[clave] = estadisticas.get(clave, 0) + valor
+    return extraer_frente_pareto(poblacion, costos, matrices)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="NSGA-II con modelo de islas")
+    parser.add_argument("instancia", nargs="?", default="tsp_KROAB100.TSP.TXT")
+    parser.add_argument("--islas", type=int, default=4)
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--poblacion", type=int, default=150, help="Tamaño de cada isla")
+    parser.add_argument("--generaciones", type=int, default=100)
+    parser.add_argument("--intervalo", type=int, default=10, help="Generaciones entre migraciones")
+    parser.add_argument("--migrantes", type=int, default=5)
+    parser.add_argument("--semilla", type=int, default=42)
+    args = parser.parse_args()
+
+    num_ciudades, matrices = cargar_instancia(args.instancia)
+    frente_pareto, costos_pareto = nsga2_islas(num_ciudades, matrices, None, args.poblacion, args.generaciones,
+                                               semilla=args.semilla, islas=args.islas,
+                                               intervalo_migracion=args.intervalo, migrantes=args.migrantes,
+                                               procesos=args.procesos)
+    print(f"{len(costos_pareto)} soluciones no dominadas")
+    for costo in sorted(costos_pareto):
+        print(costo)
@@ -1,13 +1,17 @@
 import csv
 import os
-import matplotlib.pyplot as plt
 import random
+import argparse
 
-from TSP_bi_Objetivo import evaluar_algoritmo_nsga, evaluar_algoritmo_spea
-from utils import construir_frente_Ytrue, evaluar_M1, evaluar_M2, evaluar_M3, evaluar_error
+from TSP_bi_Objetivo import evaluar_frentes_algoritmo
+from paralelo import generar_trabajos, ejecutar_en_paralelo, agrupar_frentes
+from archivo_pareto import ArchivoPareto
+from utils import construir_frente_Ytrue
+from metricas import evaluar_frentes
+from salida import EscritorSalida, guardar_frentes_npz
 
 def guardar_métricas_csv(resultados, archivo_salida="resultados_metricas.csv"):
-    campos = ["Algoritmo", "Instancia", "M1", "M2", "M3", "Error"]
+    campos = ["Algoritmo", "Instancia", "M1", "M2", "M3", "Error", "HV", "IGD+"]
     with open(archivo_salida, "w", newline="") as f:
         writer = csv.DictWriter(f, fieldnames=campos)
         writer.writeheader()
@@ -21,7 +25,13 @@ def guardar_frente_csv(frente, nombre_archivo):
         for costo in frente:
             writer.writerow(costo)
 
+# matplotlib se importa recién al graficar: las ejecuciones sin gráficos nunca lo cargan
+# Backend Agg: solo se guardan PNG, sin necesidad de pantalla (y se puede usar desde el hilo escritor)
 def graficar_frentes_comparados(frente_nsga, frente_spea, nombre_instancia):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
     x_nsga = [c[0] for c in frente_nsga]
     y_nsga = [c[1] for c in frente_nsga]
 
@@ -39,70 +49,98 @@ def graficar_frentes_comparados(frente_nsga, frente_spea, nombre_instancia):
     plt.savefig(f"comparacion_frentes_{nombre_instancia}.png")
     plt.close()
 
-def main():
+# La escritura de CSVs, gráficos y frentes_<instancia>.npz (frentes completos, con rutas) se hace en
+# segundo plano (salida.EscritorSalida) mientras se evalúa la instancia siguiente
+# graficos=False no genera los PNG (ni importa matplotlib)
+def main(procesos=None, directorio_checkpoints=None, directorio_telemetria=None, parada=None, graficos=True):
     random.seed(42)
     instancias = {
         "KROAB100": "tsp_KROAB100.TSP.TXT",
         "KROAC100": "tsp_kroac100.tsp.txt"
     }
 
+    # Todas las corridas (instancia, algoritmo, semilla) son independientes: se reparten en un pool
+    trabajos = generar_trabajos(instancias)
+    terminados = []
+    # Ytrue de cada instancia se arma a medida que terminan las corridas; el archivo es de 2 objetivos,
+    # así que con más se deja en None y se arma al final con construir_frente_Ytrue
+    ytrue = {nombre: ArchivoPareto() for nombre in instancias}
+    for resultado in ejecutar_en_paralelo(trabajos, procesos, directorio_checkpoints, directorio_telemetria, parada):
+        nombre, _, algoritmo, semilla = resultado[0]
+        estadisticas = resultado[3]
+        print(f"Terminada corrida {algoritmo} - {nombre} (semilla {semilla}): "
+              f"{estadisticas.get('generaciones')} generaciones, parada por {estadisticas.get('motivo_parada')}")
+        terminados.append(resultado)
+        costos = resultado[2]
+        if len(costos) and len(costos[0]) != 2:
+            ytrue[nombre] = None
+        if ytrue[nombre] is not None:
+            ytrue[nombre].extender(costos)
+    frentes = agrupar_frentes(terminados)
+
     resultados = []
+    escritor = EscritorSalida()
 
     for nombre, path in instancias.items():
         print(f"--- Instancia: {nombre} ---")
 
-        print("Ejecutando NSGA-II...")
-        res_nsga = evaluar_algoritmo_nsga(path)
-
-        print("Ejecutando SPEA...")
-        res_spea = evaluar_algoritmo_spea(path)
-
-        # Construir Ytrue combinando todos los frentes de ambas ejecuciones
-        todos_frentes = res_nsga["Frentes"] + res_spea["Frentes"]
-        ytrue = construir_frente_Ytrue(todos_frentes)
+        res_nsga = evaluar_frentes_algoritmo(frentes[nombre]["NSGA-II"])
+        res_spea = evaluar_frentes_algoritmo(frentes[nombre]["SPEA"])
 
-        # Recalcular métricas para NSGA-II
-        m1_nsga = evaluar_M1(res_nsga["Frentes"][0], ytrue)
-        m2_nsga = evaluar_M2(res_nsga["Frentes"][0], ytrue)
-        m3_nsga = evaluar_M3(res_nsga["Frentes"][0])
-        err_nsga = evaluar_error(res_nsga["Frentes"][0], ytrue)
+        # Ytrue combina todos los frentes de ambos algoritmos
+        if ytrue[nombre] is not None:
+            frente_ytrue = ytrue[nombre].costos()
+        else:
+            frente_ytrue = construir_frente_Ytrue(frentes[nombre]["NSGA-II"] + frentes[nombre]["SPEA"])
 
-        # Recalcular métricas para SPEA
-        m1_spea = evaluar_M1(res_spea["Frentes"][0], ytrue)
-        m2_spea = evaluar_M2(res_spea["Frentes"][0], ytrue)
-        m3_spea = evaluar_M3(res_spea["Frentes"][0])
-        err_spea = evaluar_error(res_spea["Frentes"][0], ytrue)
+        # Recalcular métricas de ambos algoritmos contra el Ytrue combinado, en una sola llamada
+        # (mismo punto de referencia del hipervolumen para los dos)
+        primeros = {"NSGA-II": res_nsga["Frentes"][0], "SPEA": res_spea["Frentes"][0]}
+        metricas = evaluar_frentes(list(primeros.values()), frente_ytrue)
 
-        # Guardar CSVs de frentes
-        guardar_frente_csv(res_nsga["Frentes"][0], f"frente_nsga_{nombre}.csv")
-        guardar_frente_csv(res_spea["Frentes"][0], f"frente_spea_{nombre}.csv")
+        # Guardar CSVs de frentes y todos los frentes (rutas incluidas) de la instancia
+        escritor.enviar(guardar_frente_csv, res_nsga["Frentes"][0], f"frente_nsga_{nombre}.csv")
+        escritor.enviar(guardar_frente_csv, res_spea["Frentes"][0], f"frente_spea_{nombre}.csv")
+        escritor.enviar(guardar_frentes_npz, f"frentes_{nombre}.npz",
+                        sorted((r for r in terminados if r[0][0] == nombre), key=lambda r: (r[0][2], r[0][3])))
 
         # Guardar resultados de métricas
-        resultados.append({
-            "Algoritmo": "NSGA-II",
-            "Instancia": nombre,
-            "M1": m1_nsga,
-            "M2": m2_nsga,
-            "M3": m3_nsga,
-            "Error": err_nsga
-        })
-
-        resultados.append({
-            "Algoritmo": "SPEA",
-            "Instancia": nombre,
-            "M1": m1_spea,
-            "M2": m2_spea,
-            "M3": m3_spea,
-            "Error": err_spea
-        })
+        for k, algoritmo in enumerate(primeros):
+            resultados.append({
+                "Algoritmo": algoritmo,
+                "Instancia": nombre,
+                **{metrica: float(valores[k]) for metrica, valores in metricas.items()}
+            })
 
         # Graficar comparación de frentes
-        graficar_frentes_comparados(res_nsga["Frentes"][0], res_spea["Frentes"][0], nombre)
+        if graficos:
+            escritor.enviar(graficar_frentes_comparados, res_nsga["Frentes"][0], res_spea["Frentes"][0], nombre)
 
-    # Guardar resultados finales de métricas
-    guardar_métricas_csv(resultados)
+    # Guardar resultados finales de métricas (y esperar a que termine toda la escritura)
+    escritor.enviar(guardar_métricas_csv, resultados)
+    escritor.cerrar()
     print("✅ Resultados guardados en 'resultados_metricas.csv'")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--procesos", type=int, default=None,
+                        help="Cantidad de procesos del pool (por defecto, todos los núcleos; 1 = en serie)")
+    parser.add_argument("--checkpoints", default=None, metavar="DIRECTORIO",
+                        help="Guarda checkpoints y resultados por corrida; al reejecutar se continúa desde ellos")
+    parser.add_argument("--telemetria", default=None, metavar="DIRECTORIO",
+                        help="Escribe tiempos por fase y datos de cada generación (un .jsonl por corrida)")
+    parser.add_argument("--tiempo-max", type=float, default=None, metavar="SEGUNDOS",
+                        help="Presupuesto de tiempo por corrida")
+    parser.add_argument("--max-evaluaciones", type=int, default=None, help="Presupuesto de evaluaciones por corrida")
+    parser.add_argument("--ventana", type=int, default=None,
+                        help="Detiene la corrida si el hipervolumen no cambia durante esta cantidad de generaciones")
+    parser.add_argument("--tolerancia", type=float, default=1e-3, help="Cambio relativo mínimo del hipervolumen")
+    parser.add_argument("--sin-graficos", action="store_true",
+                        help="No genera los gráficos de frentes (no importa matplotlib)")
+    args = parser.parse_args()
+    parada = None
+    if args.tiempo_max or args.max_evaluaciones or args.ventana:
+        parada = {"tiempo_max": args.tiempo_max, "max_evaluaciones": args.max_evaluaciones,
+                  "ventana": args.ventana, "tolerancia": args.tolerancia}
+    main(args.procesos, args.checkpoints, args.telemetria, parada, not args.sin_graficos)
@@ -0,0 +1,189 @@
+import math
+import bisect
+
+import numpy as np
+
+
+#PASO 11: Métricas M1, M2, M3, Error, hipervolumen e IGD/IGD+
+# Las búsquedas del vecino más cercano usan un barrido sobre la referencia ordenada por f1:
+# O((|A| + |Y|) log |Y|) en lugar de comparar todos los pares
+# Todas aceptan cualquier cantidad de objetivos; con 2 se usan los cálculos especializados
+
+# Costos como arreglo (N, objetivos); una lista vacía se toma como (0, 2) y un único punto como (1, objetivos)
+def arreglo_costos(costos):
+    c = np.asarray(costos, dtype=float)
+    if c.ndim == 2:
+        return c
+    return c.reshape(0, 2) if c.size == 0 else c.reshape(1, -1)
+
+# Distancia euclidiana entre dos puntos
+def distancia_euclidiana(a, b):
+    return math.dist(a, b)
+
+# Para cada punto, la distancia al punto más cercano de la referencia
+# Se busca la posición del punto por f1 (búsqueda binaria) y se avanza hacia ambos lados
+# mientras la diferencia en f1 por sí sola no supere la mejor distancia encontrada
+# Con más de 2 objetivos se comparan todos los pares, por bloques de puntos
+def distancias_minimas(puntos, referencia, bloque=1000):
+    puntos = arreglo_costos(puntos)
+    referencia = arreglo_costos(referencia)
+    if len(referencia) == 0:
+        return np.full(len(puntos), np.inf)
+    if referencia.shape[1] != 2:
+        resultado = np.empty(len(puntos))
+        for i in range(0, len(puntos), bloque):
+            diferencias = puntos[i:i + bloque, np.newaxis, :] - referencia[np.newaxis, :, :]
+            resultado[i:i + bloque] = np.sqrt((diferencias ** 2).sum(axis=2)).min(axis=1)
+        return resultado
+    orden = np.argsort(referencia[:, 0], kind="stable")
+    rx = referencia[orden, 0].tolist()
+    ry = referencia[orden, 1].tolist()
+
+    resultado = []
+    for x, y in puntos.tolist():
+        k = bisect.bisect_left(rx, x)
+        mejor = math.inf
+        for paso, inicio in ((1, k), (-1, k - 1)):
+            j = inicio
+            while 0 <= j < len(rx):
+                dx2 = (rx[j] - x) ** 2
+                if dx2 >= mejor:
+                    break
+                d2 = dx2 + (ry[j] - y) ** 2
+                if d2 < mejor:
+                    mejor = d2
+                j += paso
+        resultado.append(math.sqrt(mejor))
+    return np.array(resultado)
+
+# M1: promedio de distancias del frente obtenido al frente ideal
+def evaluar_M1(frente_algo, ytrue):
+    return float(distancias_minimas(frente_algo, ytrue).mean())
+
+# M2: promedio de distancias del frente ideal al frente obtenido
+def evaluar_M2(frente_algo, ytrue):
+    return float(distancias_minimas(ytrue, frente_algo).mean())
+
+# M3: dispersión del frente obtenido (uniformidad)
+def evaluar_M3(frente_algo):
+    if len(frente_algo) <= 1:
+        return 0
+    # Ordenar por f1 para medir dispersión
+    puntos = arreglo_costos(frente_algo)
+    puntos = puntos[np.argsort(puntos[:, 0], kind="stable")]
+    return float(np.sqrt((np.diff(puntos, axis=0) ** 2).sum(axis=1)).mean())
+
+# Error: proporción de soluciones del frente ideal no encontradas
+def evaluar_error(frente_algo, ytrue):
+    ytrue_set = set(tuple(p) for p in ytrue)
+    frente_set = set(tuple(p) for p in frente_algo)
+    no_encontradas = ytrue_set - frente_set
+    return len(no_encontradas) / len(ytrue)
+
+# IGD: promedio de distancias de cada punto del frente ideal al más cercano del frente obtenido
+def evaluar_IGD(frente_algo, ytrue):
+    return evaluar_M2(frente_algo, ytrue)
+
+# Para cada punto del ideal, la menor distancia d+(y, a) = || max(a - y, 0) || a un punto del frente
+# Con 2 objetivos basta la escalera no dominada del frente ordenada por f1 (f2 decreciente): los puntos
+# con a1 <= y1 aportan solo su exceso en f2 (el mejor es el último de ellos) y, entre los de a1 > y1,
+# el primero con a2 <= y2 aporta solo su exceso en f1; los del medio se barren mientras el exceso
+# en f1 no supere la mejor distancia. Con más objetivos se comparan todos los pares, por bloques de puntos
+def distancias_IGD_plus(ytrue, frente_algo, bloque=1000):
+    y = arreglo_costos(ytrue)
+    a = arreglo_costos(frente_algo)
+    if len(a) == 0:
+        return np.full(len(y), np.inf)
+    if a.shape[1] != 2:
+        resultado = np.empty(len(y))
+        for i in range(0, len(y), bloque):
+            exceso = np.maximum(a[np.newaxis, :, :] - y[i:i + bloque, np.newaxis, :], 0)
+            resultado[i:i + bloque] = np.sqrt((exceso ** 2).sum(axis=2)).min(axis=1)
+        return resultado
+    a = a[np.lexsort((a[:, 1], a[:, 0]))]
+    a = a[a[:, 1] < np.minimum.accumulate(np.concatenate([[np.inf], a[:-1, 1]]))]
+    ax = a[:, 0].tolist()
+    ay = a[:, 1].tolist()
+    ay_negado = (-a[:, 1]).tolist()
+
+    resultado = []
+    for x, y0 in y.tolist():
+        k = bisect.bisect_right(ax, x)
+        j = max(bisect.bisect_left(ay_negado, -y0), k)
+        mejor = max(ay[k - 1] - y0, 0) ** 2 if k > 0 else math.inf
+        if j < len(ax):
+            mejor = min(mejor, (ax[j] - x) ** 2)
+        for i in range(k, j):
+            dx2 = (ax[i] - x) ** 2
+            if dx2 >= mejor:
+                break
+            mejor = min(mejor, dx2 + (ay[i] - y0) ** 2)
+        resultado.append(math.sqrt(mejor))
+    return np.array(resultado)
+
+# IGD+: como IGD, pero solo cuenta la parte en que el punto obtenido es peor que el ideal
+# (distancia d+(y, a) = || max(a - y, 0) ||), por lo que es Pareto-compatible
+def evaluar_IGD_plus(frente_algo, ytrue):
+    return float(distancias_IGD_plus(ytrue, frente_algo).mean())
+
+# Hipervolumen exacto en 2D, O(N log N): área dominada por el frente y acotada por el punto de referencia
+# Con más objetivos se estima por Monte-Carlo (hipervolumen_montecarlo, con la caja desde inferior)
+def hipervolumen(frente_algo, referencia, inferior=None):
+    puntos = arreglo_costos(frente_algo)
+    referencia = np.asarray(referencia, dtype=float)
+    puntos = puntos[(puntos < referencia).all(axis=1)]
+    if len(puntos) == 0:
+        return 0.0
+    if len(referencia) != 2:
+        return hipervolumen_montecarlo(puntos, referencia, inferior)
+    puntos = puntos[np.lexsort((puntos[:, 1], puntos[:, 0]))]
+    # Tras ordenar por f1, un punto es no dominado si mejora el menor f2 visto hasta entonces
+    menor_previo = np.concatenate([[np.inf], np.minimum.accumulate(puntos[:-1, 1])])
+    puntos = puntos[puntos[:, 1] < menor_previo]
+    anchos = np.diff(np.append(puntos[:, 0], referencia[0]))
+    return float((anchos * (referencia[1] - puntos[:, 1])).sum())
+
+# Hipervolumen estimado por Monte-Carlo: fracción de puntos al azar de la caja [inferior, referencia]
+# dominados por el frente, por el volumen de la caja. inferior es por defecto el mínimo de cada objetivo
+# del frente; la semilla es fija, así que con una misma caja todos los frentes se miden con las mismas
+# muestras y el resultado es reproducible. El error relativo es del orden de 1 / sqrt(muestras)
+def hipervolumen_montecarlo(frente_algo, referencia, inferior=None, muestras=100000, semilla=0, bloque=5000):
+    puntos = arreglo_costos(frente_algo)
+    referencia = np.asarray(referencia, dtype=float)
+    puntos = puntos[(puntos < referencia).all(axis=1)]
+    if len(puntos) == 0:
+        return 0.0
+    inferior = puntos.min(axis=0) if inferior is None else np.minimum(np.asarray(inferior, dtype=float), referencia)
+    generador = np.random.default_rng(semilla)
+    dominadas = 0
+    for inicio in range(0, muestras, bloque):
+        m = generador.uniform(inferior, referencia, size=(min(bloque, muestras - inicio), len(referencia)))
+        dominadas += int((puntos[np.newaxis, :, :] <= m[:, np.newaxis, :]).all(axis=2).any(axis=1).sum())
+    return float(np.prod(referencia - inferior) * dominadas / muestras)
+
+# Punto de referencia para el hipervolumen: el peor valor de cada objetivo más un margen del rango
+def punto_referencia(frentes, margen=0.1):
+    puntos = np.concatenate([arreglo_costos(f) for f in frentes])
+    peor, mejor = puntos.max(axis=0), puntos.min(axis=0)
+    return peor + margen * (peor - mejor)
+
+# Evalúa muchos frentes contra una misma referencia en una sola llamada
+# Devuelve un diccionario métrica -> arreglo con un valor por frente
+# Con más de 2 objetivos el hipervolumen de todos los frentes se estima sobre una misma caja (y muestras)
+def evaluar_frentes(frentes, ytrue, referencia=None):
+    if referencia is None:
+        referencia = punto_referencia(list(frentes) + [ytrue])
+    arreglos = [arreglo_costos(f) for f in frentes]
+    inferior = np.concatenate(arreglos + [arreglo_costos(ytrue)]).min(axis=0)
+    # M1 de todos los frentes con una única búsqueda sobre Ytrue, luego se promedia por tramos
+    tamanos = np.array([len(f) for f in arreglos])
+    distancias = distancias_minimas(np.concatenate(arreglos), ytrue)
+    m1 = np.add.reduceat(distancias, np.concatenate([[0], np.cumsum(tamanos)[:-1]])) / tamanos
+    return {
+        "M1": m1,
+        "M2": np.array([evaluar_M2(f, ytrue) for f in arreglos]),
+        "M3": np.array([evaluar_M3(f) for f in arreglos]),
+        "Error": np.array([evaluar_error(f, ytrue) for f in frentes]),
+        "HV": np.array([hipervolumen(f, referencia, inferior) for f in arreglos]),
+        "IGD+": np.array([evaluar_IGD_plus(f, ytrue) for f in arreglos]),
+    }
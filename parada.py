@@ -0,0 +1,118 @@
+import time
+from collections import deque
+
+import numpy as np
+
+from archivo_pareto import ArchivoPareto
+from metricas import hipervolumen_montecarlo
+from utils import indices_no_dominados
+
+
+# Criterios de parada por presupuesto y por convergencia
+# Una corrida termina en cuanto se cumple cualquiera de ellos (o se agotan las generaciones):
+#   "tiempo": se superó tiempo_max segundos de reloj
+#   "evaluaciones": se superaron max_evaluaciones evaluaciones completas de rutas
+#   "estancamiento": el hipervolumen del mejor frente encontrado hasta ahora mejoró menos que
+#                    tolerancia (relativa) durante las últimas `ventana` generaciones
+# El mejor frente se mantiene en un archivo_pareto.ArchivoPareto, que actualiza el hipervolumen con
+# cada punto insertado (solo se suma el área nueva), así cada control cuesta O(|F| log |F|).
+# El punto de referencia se fija con el primer frente observado.
+# Con más de 2 objetivos el mejor frente es un arreglo de no dominados y el hipervolumen se estima por
+# Monte-Carlo con muestras fijas en la caja [0, referencia] (los costos del TSP no son negativos):
+# con las mismas muestras el valor no baja cuando el frente mejora.
+
+OPCIONES_PARADA = {
+    "tiempo_max": None,
+    "max_evaluaciones": None,
+    "ventana": None,
+    "tolerancia": 1e-3,
+}
+
+
+class CriterioParada:
+    def __init__(self, tiempo_max=None, max_evaluaciones=None, ventana=None, tolerancia=1e-3, margen=0.1):
+        self.tiempo_max = tiempo_max
+        self.max_evaluaciones = max_evaluaciones
+        self.ventana = ventana
+        self.tolerancia = tolerancia
+        self.margen = margen
+        self.archivo = None  # se crea con el primer frente, que fija el punto de referencia
+        self.frente, self.referencia = None, None  # en lugar del archivo, con más de 2 objetivos
+        self.historial = deque(maxlen=ventana + 1 if ventana else 1)
+        self.motivo = None
+        self.generaciones = 0
+        self._inicio = None
+
+    # True si alguno de los criterios termina la corrida por sí solo (sin un límite de generaciones);
+    # el estancamiento llega siempre que tolerancia > 0, porque el hipervolumen está acotado
+    @property
+    def limitado(self):
+        return (self.tiempo_max is not None or self.max_evaluaciones is not None
+                or bool(self.ventana and self.tolerancia > 0))
+
+    # Comienzo (o continuación desde un checkpoint) de la corrida
+    # Al continuar, el tiempo ya usado se descuenta del presupuesto de tiempo
+    def iniciar(self, estado=None):
+        self._inicio = time.perf_counter()
+        self.motivo = None
+        if estado:
+            self._inicio -= estado.get("segundos", 0.0)
+            self.archivo = estado["archivo"]
+            self.frente, self.referencia = estado.get("frente"), estado.get("referencia")
+            self.historial.extend(estado["historial"])
+            self.generaciones = estado["generaciones"]
+
+    # Lo necesario para que una corrida reanudada decida igual que una sin interrupciones
+    def estado(self):
+        return {"archivo": self.archivo, "frente": self.frente, "referencia": self.referencia,
+                "historial": list(self.historial), "generaciones": self.generaciones,
+                "segundos": time.perf_counter() - self._inicio}
+
+    # Se llama al final de cada generación con los costos del mejor frente actual;
+    # devuelve el motivo de parada o None si la corrida debe continuar
+    def actualizar(self, costos_frente, evaluaciones=0):
+        self.generaciones += 1
+        if self.max_evaluaciones is not None and evaluaciones >= self.max_evaluaciones:
+            self.motivo = "evaluaciones"
+        elif self.tiempo_max is not None and time.perf_counter() - self._inicio >= self.tiempo_max:
+            self.motivo = "tiempo"
+        elif self.ventana and self._estancado(costos_frente):
+            self.motivo = "estancamiento"
+        return self.motivo
+
+    def _estancado(self, costos_frente):
+        costos_frente = np.asarray(costos_frente, dtype=float)
+        if costos_frente.shape[1] != 2:
+            hipervolumen = self._hipervolumen_objetivos(costos_frente)
+        else:
+            if self.archivo is None:
+                self.archivo = ArchivoPareto(referencia=self._referencia(costos_frente))
+            self.archivo.extender(costos_frente.tolist())
+            hipervolumen = self.archivo.hipervolumen
+        self.historial.append(hipervolumen)
+        if len(self.historial) <= self.ventana:
+            return False
+        return hipervolumen > 0 and (hipervolumen - self.historial[0]) / hipervolumen < self.tolerancia
+
+    def _referencia(self, costos_frente):
+        peor, mejor = costos_frente.max(axis=0), costos_frente.min(axis=0)
+        return peor + self.margen * (peor - mejor) + 1
+
+    def _hipervolumen_objetivos(self, costos_frente, muestras=20000):
+        if self.frente is None:
+            self.referencia = self._referencia(costos_frente)
+            self.frente = costos_frente
+        else:
+            self.frente = np.concatenate([self.frente, costos_frente])
+        self.frente = self.frente[indices_no_dominados(self.frente)]
+        return hipervolumen_montecarlo(self.frente, self.referencia, np.zeros(len(self.referencia)), muestras)
+
+
+# Crea el criterio a partir de un diccionario de opciones (None = sin criterio)
+# Con generaciones=None, alguno de los criterios tiene que poder terminar la corrida
+def crear_criterio_parada(opciones, generaciones):
+    criterio = None if opciones is None else CriterioParada(**{**OPCIONES_PARADA, **opciones})
+    if generaciones is None and (criterio is None or not criterio.limitado):
+        raise ValueError("Sin límite de generaciones hace falta un criterio de parada que termine la corrida "
+                         "(tiempo_max, max_evaluaciones o ventana con tolerancia > 0)")
+    return criterio
@@ -0,0 +1,113 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import utils
+from checkpoint import nombre_trabajo, ruta_checkpoint, identidad_resultado, guardar_resultado, cargar_resultado
+from instrumentacion import Instrumentacion
+from TSP_bi_Objetivo import nsga2, spea, PARAMETROS_NSGA, PARAMETROS_SPEA
+
+
+# Ejecución en paralelo de corridas independientes (instancia, algoritmo, semilla)
+
+# Algoritmos disponibles con sus parámetros por defecto
+ALGORITMOS = {
+    "NSGA-II": (nsga2, PARAMETROS_NSGA),
+    "SPEA": (spea, PARAMETROS_SPEA),
+}
+
+# Instancias ya cargadas por este proceso (cada worker abre cada archivo una sola vez;
+# la caché binaria con memory-map hace que todos compartan las mismas páginas)
+_instancias_cargadas = {}
+
+
+def cargar_instancia(path):
+    if path not in _instancias_cargadas:
+        _instancias_cargadas[path] = utils.cargar_instancia(path)
+    return _instancias_cargadas[path]
+
+
+# Un trabajo es una tupla (nombre_instancia, path, algoritmo, semilla), opcionalmente con un quinto
+# elemento: diccionario de parámetros que reemplazan a los del algoritmo (ver barrido.py)
+# path puede ser también una tupla de archivos TSPLIB de coordenadas (ver utils.cargar_instancia)
+def generar_trabajos(instancias, algoritmos=("NSGA-II", "SPEA"), repeticiones=5, semilla_base=42):
+    return [(nombre, path, algoritmo, semilla_base + i)
+            for nombre, path in instancias.items()
+            for algoritmo in algoritmos
+            for i in range(repeticiones)]
+
+
+# Parámetros del algoritmo para un trabajo: los por defecto, reemplazados por los propios del trabajo
+def parametros_trabajo(trabajo):
+    _, parametros = ALGORITMOS[trabajo[2]]
+    return {**parametros, **trabajo[4]} if len(trabajo) > 4 else dict(parametros)
+
+
+# Ejecuta un trabajo con su propio generador random.Random(semilla):
+# el resultado es idéntico al de la ejecución en serie con la misma semilla
+# Con directorio_checkpoints, la corrida guarda checkpoints periódicos (y continúa desde el último
+# si existe) y al terminar registra su resultado
+# Con directorio_telemetria, cada corrida escribe sus eventos por generación en <trabajo>.jsonl
+# parada: opciones de parada.OPCIONES_PARADA aplicadas a todas las corridas (None = solo generaciones)
+# instrumentacion: Instrumentacion propia de la corrida (reemplaza a la de directorio_telemetria)
+# Devuelve (trabajo, frente_pareto, costos_pareto, estadisticas); estadisticas trae las evaluaciones,
+# el motivo de parada y las generaciones ejecutadas
+def ejecutar_trabajo(trabajo, directorio_checkpoints=None, directorio_telemetria=None, parada=None,
+                     instrumentacion=None):
+    nombre, path, algoritmo, semilla = trabajo[:4]
+    num_ciudades, matrices = cargar_instancia(path)
+    funcion, _ = ALGORITMOS[algoritmo]
+    parametros = parametros_trabajo(trabajo)
+    identidad = identidad_resultado(trabajo, parametros, parada)
+    rng = random.Random(semilla)
+    if directorio_checkpoints:
+        parametros = {**parametros, "checkpoint": ruta_checkpoint(directorio_checkpoints, trabajo)}
+    if directorio_telemetria:
+        archivo = os.path.join(directorio_telemetria, nombre_trabajo(trabajo) + ".jsonl")
+        parametros = {**parametros, "instrumentacion": Instrumentacion(archivo)}
+    if instrumentacion is not None:
+        parametros = {**parametros, "instrumentacion": instrumentacion}
+    if parada:
+        parametros = {**parametros, "parada": parada}
+    estadisticas = {}
+    frente_pareto, costos_pareto = funcion(num_ciudades, matrices, None, **parametros, rng=rng,
+                                           estadisticas=estadisticas)
+    if directorio_checkpoints:
+        guardar_resultado(directorio_checkpoints, trabajo, frente_pareto, costos_pareto, identidad, estadisticas)
+    return trabajo, frente_pareto, costos_pareto, estadisticas
+
+
+# Reparte los trabajos en un pool de procesos y devuelve los resultados a medida que terminan
+# procesos=1 ejecuta todo en el proceso actual (modo serie)
+# Con directorio_checkpoints, los trabajos ya terminados en una ejecución anterior con la misma identidad
+# (instancia, parámetros y criterio de parada) no se repiten
+def ejecutar_en_paralelo(trabajos, procesos=None, directorio_checkpoints=None, directorio_telemetria=None, parada=None):
+    procesos = procesos or os.cpu_count() or 1
+    pendientes = []
+    for trabajo in trabajos:
+        resultado = None
+        if directorio_checkpoints:
+            resultado = cargar_resultado(directorio_checkpoints, trabajo,
+                                         identidad_resultado(trabajo, parametros_trabajo(trabajo), parada))
+        if resultado is not None:
+            yield resultado
+        else:
+            pendientes.append(trabajo)
+
+    if procesos == 1:
+        for trabajo in pendientes:
+            yield ejecutar_trabajo(trabajo, directorio_checkpoints, directorio_telemetria, parada)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(procesos, len(pendientes) or 1)) as pool:
+        futuros = [pool.submit(ejecutar_trabajo, trabajo, directorio_checkpoints, directorio_telemetria, parada) for trabajo in pendientes]
+        for futuro in as_completed(futuros):
+            yield futuro.result()
+
+
+# Agrupa los frentes por instancia y algoritmo, ordenados por semilla
+def agrupar_frentes(resultados):
+    agrupados = {}
+    for (nombre, _, algoritmo, semilla, *_), _, costos_pareto, _ in sorted(resultados, key=lambda r: r[0][3]):
+        agrupados.setdefault(nombre, {}).setdefault(algoritmo, []).append(costos_pareto)
+    return agrupados
@@ -0,0 +1,52 @@
+import numpy as np
+
+
+# Población respaldada por arreglos contiguos: una fila por ruta en un bloque (capacidad, n)
+# de uint16 (hasta 65536 ciudades) o int32, y sus costos en un bloque (capacidad, objetivos).
+# Hay dos juegos de bloques: la supervivencia copia a los elegidos al bloque libre y lo convierte
+# en el actual, así que entre generaciones no se crean listas ni arreglos nuevos.
+# rutas y costos devuelven vistas (sin copia) de las filas ocupadas.
+
+def tipo_rutas(num_ciudades):
+    return np.uint16 if num_ciudades <= 2**16 else np.int32
+
+
+class Poblacion:
+    def __init__(self, capacidad, num_ciudades, num_objetivos=2):
+        tipo = tipo_rutas(num_ciudades)
+        self._rutas = [np.empty((capacidad, num_ciudades), dtype=tipo) for _ in range(2)]
+        self._costos = [np.empty((capacidad, num_objetivos)) for _ in range(2)]
+        self._actual = 0
+        self.tam = 0
+
+    def __len__(self):
+        return self.tam
+
+    @property
+    def rutas(self):
+        return self._rutas[self._actual][:self.tam]
+
+    @property
+    def costos(self):
+        return self._costos[self._actual][:self.tam]
+
+    # Reemplaza el contenido por las rutas (listas o arreglo) y costos dados
+    def cargar(self, rutas, costos):
+        self.tam = len(rutas)
+        self.rutas[:] = rutas
+        self.costos[:] = costos
+
+    # Agrega `cantidad` filas al final y devuelve sus vistas (rutas, costos) para escribir en ellas
+    def reservar(self, cantidad):
+        inicio = self.tam
+        self.tam += cantidad
+        return self.rutas[inicio:], self.costos[inicio:]
+
+    # Conserva solo las filas indicadas, en ese orden (copia al otro bloque y lo vuelve el actual)
+    def conservar(self, indices):
+        indices = np.asarray(indices, dtype=np.intp)
+        siguiente = 1 - self._actual
+        np.take(self.rutas, indices, axis=0, out=self._rutas[siguiente][:len(indices)])
+        np.take(self.costos, indices, axis=0, out=self._costos[siguiente][:len(indices)])
+        self._actual = siguiente
+        self.tam = len(indices)
@@ -0,0 +1,86 @@
+import json
+import queue
+import threading
+
+import numpy as np
+
+from poblacion import tipo_rutas
+
+
+# Salida de resultados fuera del camino crítico
+# EscritorSalida ejecuta en un hilo aparte las tareas de escritura (CSV, gráficos, .npz) que le envía
+# el hilo principal, que sigue calculando mientras tanto. La cola es acotada: si la escritura se atrasa,
+# enviar espera en lugar de acumular resultados sin límite. El primer error de una tarea se vuelve a
+# lanzar al cerrar el escritor (las tareas siguientes se siguen ejecutando).
+
+_FIN = object()
+
+
+class EscritorSalida:
+    def __init__(self, capacidad=64):
+        self._cola = queue.Queue(maxsize=capacidad)
+        self._error = None
+        self.tareas = 0
+        self._hilo = threading.Thread(target=self._ejecutar, name="escritor-salida", daemon=True)
+        self._hilo.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar(relanzar=tipo is None)
+
+    # Encola funcion(*args, **kwargs); los argumentos no deben modificarse después de enviarlos
+    def enviar(self, funcion, *args, **kwargs):
+        self._cola.put((funcion, args, kwargs))
+
+    # Espera a que terminen todas las tareas enviadas
+    def cerrar(self, relanzar=True):
+        if self._hilo.is_alive():
+            self._cola.put(_FIN)
+            self._hilo.join()
+        if relanzar and self._error is not None:
+            raise RuntimeError(f"Falló una tarea de escritura: {self._error!r}") from self._error
+
+    def _ejecutar(self):
+        while True:
+            tarea = self._cola.get()
+            if tarea is _FIN:
+                return
+            funcion, args, kwargs = tarea
+            try:
+                funcion(*args, **kwargs)
+                self.tareas += 1
+            except Exception as error:
+                if self._error is None:
+                    self._error = error
+
+
+# Volcado columnar y comprimido de frentes completos (rutas incluidas)
+# resultados: tuplas (trabajo, rutas, costos, estadisticas) de una misma instancia, como las que devuelve
+# paralelo.ejecutar_en_paralelo. Una fila por solución en `rutas` (uint16 o int32) y `costos`;
+# por corrida, `inicio` indica su primera fila (inicio[i]:inicio[i+1]) junto con algoritmo, semilla
+# y parámetros propios del trabajo (JSON, vacío si no tiene)
+def guardar_frentes_npz(ruta, resultados):
+    resultados = list(resultados)
+    rutas = [np.asarray(rutas_corrida).reshape(len(costos), -1) for _, rutas_corrida, costos, _ in resultados]
+    costos = [np.asarray(costos, dtype=float).reshape(len(costos), -1) for _, _, costos, _ in resultados]
+    num_ciudades = max((r.shape[1] for r in rutas), default=0)
+    np.savez_compressed(
+        ruta,
+        algoritmo=np.array([trabajo[2] for trabajo, *_ in resultados], dtype=str),
+        semilla=np.array([trabajo[3] for trabajo, *_ in resultados], dtype=np.int64),
+        parametros=np.array([json.dumps(trabajo[4], sort_keys=True) if len(trabajo) > 4 else ""
+                             for trabajo, *_ in resultados], dtype=str),
+        inicio=np.concatenate([[0], np.cumsum([len(c) for c in costos], dtype=np.int64)]),
+        rutas=np.concatenate(rutas).astype(tipo_rutas(num_ciudades)) if rutas else np.empty((0, 0), np.uint16),
+        costos=np.concatenate(costos) if costos else np.empty((0, 2)),
+    )
+
+# Lee un volcado de guardar_frentes_npz: lista de (algoritmo, semilla, rutas, costos) por corrida
+def cargar_frentes_npz(ruta):
+    with np.load(ruta) as datos:
+        inicio = datos["inicio"]
+        return [(str(datos["algoritmo"][i]), int(datos["semilla"][i]),
+                 datos["rutas"][inicio[i]:inicio[i + 1]], datos["costos"][inicio[i]:inicio[i + 1]])
+                for i in range(len(inicio) - 1)]
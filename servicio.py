@@ -0,0 +1,510 @@
+import argparse
+import collections
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib import error as urlerror, parse, request as urlrequest
+
+import numpy as np
+
+import paralelo
+import utils
+from instrumentacion import Instrumentacion
+from paralelo import ALGORITMOS, ejecutar_trabajo
+from parada import OPCIONES_PARADA
+
+
+# Servicio local de resolución: un proceso de larga vida que mantiene las instancias cargadas y un pool
+# de procesos caliente, y atiende corridas de NSGA-II / SPEA por HTTP en localhost
+# Los trabajos esperan en una cola con prioridad (menor valor = antes; a igual prioridad, por orden de
+# llegada) y se despachan a medida que se libera un proceso; cada uno transmite sus eventos (frentes
+# intermedios y resultado final) como líneas JSON mientras se ejecuta.
+#
+# Uso:
+#   python servicio.py --puerto 8765 --procesos 4 [--instancia NOMBRE=ARCHIVO ...] [--directorio-instancias DIR]
+#
+# API (JSON):
+#   GET    /instancias                 registro de instancias: nombre -> {path, ciudades, objetivos}
+#   POST   /instancias                 {"nombre", "path"}: registra y carga una instancia más; path (o lista de
+#                                       archivos de coordenadas) es relativo a --directorio-instancias
+#   GET    /estado                     procesos, trabajos en cola / en ejecución / terminados
+#   POST   /trabajos                   {"instancia", "algoritmo", "semilla", "parametros", "parada", "prioridad",
+#                                       "intervalo_frentes", "incluir_rutas"} -> {"id"}
+#   GET    /trabajos/<id>              estado del trabajo (y su resultado, si terminó)
+#   GET    /trabajos/<id>/eventos      eventos del trabajo, una línea JSON por evento, hasta que termina
+#   DELETE /trabajos/<id>              cancela un trabajo que todavía está en cola
+#
+# Eventos: en_cola, inicio, frente (gen, costos del primer frente cada intervalo_frentes generaciones),
+# y uno final: resultado (costos, estadísticas y, si se pidieron, rutas), error o cancelado
+#
+# Los POST deben enviarse con Content-Type: application/json (un formulario o un fetch "simple" de una
+# página web no puede hacerlo sin permiso del servidor). Los clientes solo fijan PARAMETROS_PERMITIDOS:
+# checkpoint, estadisticas, etc. escriben archivos o estado del proceso y quedan reservados al servicio.
+
+HOST = "127.0.0.1"
+PUERTO = 8765
+EVENTOS_FINALES = ("resultado", "error", "cancelado")
+PARAMETROS_PERMITIDOS = ("tam_poblacion", "generaciones", "prob_mutacion", "tamano_archivo", "busqueda_local",
+                         "duplicados")
+
+
+#Paso 1: Procesos de trabajo
+# Cola por la que los procesos de trabajo envían los eventos de sus corridas al servicio
+_eventos = None
+
+
+# Se ejecuta al arrancar cada proceso del pool: deja las instancias del registro ya cargadas
+def _iniciar_trabajador(cola, paths):
+    global _eventos
+    _eventos = cola
+    for path in paths:
+        paralelo.cargar_instancia(path)
+
+
+# Tarea vacía para arrancar los procesos del pool antes del primer trabajo
+def _calentar(espera):
+    time.sleep(espera)
+    return os.getpid()
+
+
+# Ejecuta un trabajo en un proceso del pool; los eventos (y el resultado) viajan por la cola de eventos,
+# de modo que el cliente los recibe en orden
+def _resolver(id_trabajo, trabajo, parada, intervalo_frentes, incluir_rutas):
+    _eventos.put((id_trabajo, {"evento": "inicio", "proceso": os.getpid()}))
+    instrumentacion = None
+    if intervalo_frentes:
+        instrumentacion = Instrumentacion(frentes=True)
+
+        @instrumentacion.suscribir
+        def publicar(evento):
+            if evento["evento"] == "generacion" and (evento["gen"] + 1) % intervalo_frentes == 0:
+                _eventos.put((id_trabajo, {"evento": "frente", "gen": evento["gen"], "costos": evento["frente"]}))
+
+    _, frente_pareto, costos_pareto, estadisticas = ejecutar_trabajo(trabajo, parada=parada,
+                                                                     instrumentacion=instrumentacion)
+    resultado = {"evento": "resultado", "costos": np.asarray(costos_pareto).tolist(), "estadisticas": estadisticas}
+    if incluir_rutas:
+        resultado["rutas"] = np.asarray(frente_pareto).tolist()
+    _eventos.put((id_trabajo, resultado))
+
+
+# Valida un número recibido de un cliente: finito, entero si se pide y no menor que minimo
+def _numero(nombre, valor, entero=False, minimo=None):
+    tipos = (int,) if entero else (int, float)
+    if isinstance(valor, bool) or not isinstance(valor, tipos) or not math.isfinite(valor):
+        raise ValueError(f"{nombre} debe ser un número {'entero ' if entero else ''}finito: {valor!r}")
+    if minimo is not None and valor < minimo:
+        raise ValueError(f"{nombre} debe ser al menos {minimo}: {valor!r}")
+    return valor
+
+
+#Paso 2: Servicio (registro de instancias, pool caliente y cola con prioridad)
+class ServicioSolver:
+    # instancias: nombre -> path (o tupla de archivos de coordenadas), como en barrido.INSTANCIAS
+    # procesos: tamaño del pool (None = un proceso por núcleo)
+    # conservar: cantidad de trabajos terminados que se recuerdan (los más viejos se olvidan)
+    # directorio_instancias: única carpeta de la que los clientes pueden registrar instancias (None = ninguna)
+    def __init__(self, instancias=None, procesos=None, conservar=1000, directorio_instancias=None):
+        self.procesos = procesos or os.cpu_count() or 1
+        self.conservar = conservar
+        self.directorio_instancias = directorio_instancias and os.path.realpath(directorio_instancias)
+        self.instancias = {}
+        for nombre, path in (instancias or {}).items():
+            self.registrar(nombre, path)
+
+        # El pool arranca antes que los hilos del servicio (los procesos se crean con fork)
+        self._cola_eventos = multiprocessing.Queue()
+        self._pool = ProcessPoolExecutor(self.procesos, initializer=_iniciar_trabajador,
+                                         initargs=(self._cola_eventos, [d["path"] for d in self.instancias.values()]))
+        self.pids = sorted(set(self._pool.map(_calentar, [0.05] * self.procesos)))
+
+        self._condicion = threading.Condition()
+        self._trabajos = {}
+        self._terminados = collections.deque()
+        self._pendientes = queue.PriorityQueue()
+        self._secuencia = itertools.count()
+        self._ids = itertools.count(1)
+        self._libres = threading.Semaphore(self.procesos)
+        self._activo = True
+        self._hilos = [threading.Thread(target=objetivo, name=nombre, daemon=True)
+                       for nombre, objetivo in (("despachador", self._despachar), ("eventos", self._recibir_eventos))]
+        for hilo in self._hilos:
+            hilo.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    # Carga la instancia en este proceso (para validarla y conocer su tamaño); los procesos del pool la cargan
+    # al arrancar o, si se registra después, con su primer trabajo (y la conservan para los siguientes)
+    def registrar(self, nombre, path):
+        path = tuple(path) if isinstance(path, list) else path
+        num_ciudades, matrices = utils.cargar_instancia(path)
+        self.instancias[nombre] = {"path": path, "ciudades": num_ciudades, "objetivos": int(matrices.shape[0])}
+        return self.instancias[nombre]
+
+    # Registro a pedido de un cliente: archivo (o lista de archivos de coordenadas) relativo a
+    # directorio_instancias; se rechaza todo lo que, resueltos los enlaces, quede fuera de esa carpeta
+    def registrar_archivo(self, nombre, archivo):
+        if self.directorio_instancias is None:
+            raise ValueError("El servicio no admite registrar instancias (iniciarlo con --directorio-instancias)")
+        archivos = [archivo] if isinstance(archivo, str) else list(archivo)
+        rutas = []
+        for relativo in archivos:
+            ruta = os.path.realpath(os.path.join(self.directorio_instancias, relativo))
+            if os.path.commonpath([ruta, self.directorio_instancias]) != self.directorio_instancias \
+                    or not os.path.isfile(ruta):
+                raise ValueError(f"{relativo!r} no es un archivo de {self.directorio_instancias}")
+            rutas.append(ruta)
+        return self.registrar(nombre, rutas[0] if isinstance(archivo, str) else rutas)
+
+    # Encola un trabajo y devuelve su identificador
+    # parametros: reemplazan a los del algoritmo (como el quinto elemento de un trabajo de paralelo);
+    # solo se aceptan PARAMETROS_PERMITIDOS (tamano_archivo, solo en SPEA)
+    # parada: opciones de parada.OPCIONES_PARADA; intervalo_frentes: cada cuántas generaciones se transmite
+    # el primer frente (0 = solo el resultado final)
+    def enviar(self, instancia, algoritmo, semilla=42, parametros=None, parada=None, prioridad=0,
+               intervalo_frentes=0, incluir_rutas=False):
+        if instancia not in self.instancias:
+            raise ValueError(f"Instancia no registrada: {instancia!r}")
+        if algoritmo not in ALGORITMOS:
+            raise ValueError(f"Algoritmo desconocido: {algoritmo!r} (disponibles: {', '.join(ALGORITMOS)})")
+        permitidos = [p for p in PARAMETROS_PERMITIDOS if p != "tamano_archivo" or p in ALGORITMOS[algoritmo][1]]
+        for nombre, opciones, validas in (("parametros", parametros, permitidos), ("parada", parada, OPCIONES_PARADA)):
+            if opciones is not None and not isinstance(opciones, dict):
+                raise ValueError(f"{nombre} debe ser un objeto JSON")
+            desconocidas = sorted(set(opciones or {}) - set(validas))
+            if desconocidas:
+                raise ValueError(f"Opciones de {nombre} no permitidas: {', '.join(desconocidas)} "
+                                 f"(permitidas: {', '.join(validas)})")
+        # Se valida todo antes de registrar el trabajo: un valor no comparable en la cola rompería el despachador
+        prioridad = _numero("prioridad", prioridad)
+        intervalo_frentes = _numero("intervalo_frentes", intervalo_frentes, entero=True, minimo=0)
+        trabajo = (instancia, self.instancias[instancia]["path"], algoritmo, _numero("semilla", semilla, entero=True))
+        if parametros:
+            trabajo += (dict(parametros),)
+        with self._condicion:
+            if not self._activo:
+                raise RuntimeError("El servicio está cerrado")
+            id_trabajo = str(next(self._ids))
+            self._trabajos[id_trabajo] = {
+                "trabajo": trabajo, "parada": parada, "prioridad": prioridad,
+                "intervalo_frentes": intervalo_frentes, "incluir_rutas": bool(incluir_rutas),
+                "estado": "en_cola", "enviado": time.time(),
+                "eventos": [{"evento": "en_cola", "prioridad": prioridad}],
+            }
+            self._pendientes.put((prioridad, next(self._secuencia), id_trabajo))
+        return id_trabajo
+
+    # Estado de un trabajo sin la lista de eventos (KeyError si no existe)
+    def estado_trabajo(self, id_trabajo):
+        with self._condicion:
+            registro = self._trabajos[id_trabajo]
+            estado = {"id": id_trabajo, "instancia": registro["trabajo"][0], "algoritmo": registro["trabajo"][2],
+                      "semilla": registro["trabajo"][3], "prioridad": registro["prioridad"],
+                      "estado": registro["estado"], "eventos": len(registro["eventos"])}
+            for clave in ("espera", "segundos"):
+                if clave in registro:
+                    estado[clave] = registro[clave]
+            if registro["eventos"][-1]["evento"] in EVENTOS_FINALES:
+                estado["final"] = registro["eventos"][-1]
+            return estado
+
+    def resumen(self):
+        with self._condicion:
+            estados = collections.Counter(registro["estado"] for registro in self._trabajos.values())
+        return {"procesos": self.procesos, "pids": self.pids, "instancias": list(self.instancias), **estados}
+
+    # Eventos del trabajo a partir del número `desde` (acotado a los ya emitidos); se bloquea hasta que llegan
+    # los siguientes y termina con el evento final, o sin eventos si el trabajo ya terminó antes de `desde`
+    def eventos(self, id_trabajo, desde=0):
+        desde = _numero("desde", desde, entero=True, minimo=0)
+        with self._condicion:
+            registro = self._trabajos[id_trabajo]
+            desde = min(desde, len(registro["eventos"]))
+        while True:
+            with self._condicion:
+                self._condicion.wait_for(lambda: len(registro["eventos"]) > desde
+                                         or registro["eventos"][-1]["evento"] in EVENTOS_FINALES)
+                nuevos = registro["eventos"][desde:]
+            if not nuevos:
+                return
+            yield from nuevos
+            desde += len(nuevos)
+            if nuevos[-1]["evento"] in EVENTOS_FINALES:
+                return
+
+    # Solo se cancelan los trabajos que todavía están en cola
+    def cancelar(self, id_trabajo):
+        with self._condicion:
+            registro = self._trabajos[id_trabajo]
+            if registro["estado"] != "en_cola":
+                raise ValueError(f"El trabajo {id_trabajo} no está en cola ({registro['estado']})")
+            self._agregar_evento(id_trabajo, {"evento": "cancelado"})
+        return self.estado_trabajo(id_trabajo)
+
+    # Deja de aceptar trabajos, cancela los que están en cola y espera a los que están en ejecución
+    def cerrar(self):
+        with self._condicion:
+            if not self._activo:
+                return
+            self._activo = False
+            for id_trabajo, registro in list(self._trabajos.items()):
+                if registro["estado"] == "en_cola":
+                    self._agregar_evento(id_trabajo, {"evento": "cancelado"})
+        self._pendientes.put((math.inf, next(self._secuencia), None))
+        self._libres.release()
+        self._hilos[0].join()
+        self._pool.shutdown(wait=True)
+        self._cola_eventos.put(None)
+        self._hilos[1].join()
+        self._cola_eventos.close()
+
+    # Toma el trabajo de mayor prioridad cada vez que hay un proceso libre
+    # Un fallo al despachar (p. ej. el pool roto) termina con error ese trabajo, no el hilo
+    def _despachar(self):
+        while True:
+            self._libres.acquire()
+            id_trabajo = None
+            try:
+                _, _, id_trabajo = self._pendientes.get()
+                if not self._activo:
+                    return
+                with self._condicion:
+                    registro = self._trabajos.get(id_trabajo)
+                    if registro is None or registro["estado"] != "en_cola":
+                        self._libres.release()
+                        continue
+                    registro["estado"] = "despachado"
+                futuro = self._pool.submit(_resolver, id_trabajo, registro["trabajo"], registro["parada"],
+                                           registro["intervalo_frentes"], registro["incluir_rutas"])
+            except Exception as error:
+                self._libres.release()
+                if id_trabajo is not None:
+                    with self._condicion:
+                        self._agregar_evento(id_trabajo, {"evento": "error", "mensaje": repr(error)})
+                continue
+            futuro.add_done_callback(lambda futuro, id_trabajo=id_trabajo: self._terminar(id_trabajo, futuro))
+
+    # El resultado llega por la cola de eventos; aquí solo se libera el proceso y se informan los errores
+    def _terminar(self, id_trabajo, futuro):
+        self._libres.release()
+        excepcion = futuro.exception()
+        if excepcion is not None:
+            with self._condicion:
+                self._agregar_evento(id_trabajo, {"evento": "error", "mensaje": repr(excepcion)})
+
+    def _recibir_eventos(self):
+        while True:
+            mensaje = self._cola_eventos.get()
+            if mensaje is None:
+                return
+            with self._condicion:
+                self._agregar_evento(*mensaje)
+
+    # Se llama con self._condicion tomada
+    def _agregar_evento(self, id_trabajo, evento):
+        registro = self._trabajos.get(id_trabajo)
+        if registro is None or registro["eventos"][-1]["evento"] in EVENTOS_FINALES:
+            return
+        registro["eventos"].append(evento)
+        ahora = time.time()
+        if evento["evento"] == "inicio":
+            registro["estado"] = "ejecutando"
+            registro["inicio"] = ahora
+            registro["espera"] = ahora - registro["enviado"]
+        elif evento["evento"] in EVENTOS_FINALES:
+            registro["estado"] = "terminado" if evento["evento"] == "resultado" else evento["evento"]
+            if "inicio" in registro:
+                registro["segundos"] = ahora - registro["inicio"]
+            self._terminados.append(id_trabajo)
+            while len(self._terminados) > self.conservar:
+                self._trabajos.pop(self._terminados.popleft(), None)
+        self._condicion.notify_all()
+
+
+#Paso 3: Servidor HTTP
+class _Manejador(BaseHTTPRequestHandler):
+    def do_GET(self):
+        ruta, consulta = self._ruta()
+        servicio = self.server.servicio
+        if ruta == ["instancias"]:
+            self._responder(200, servicio.instancias)
+        elif ruta == ["estado"]:
+            self._responder(200, servicio.resumen())
+        elif len(ruta) == 2 and ruta[0] == "trabajos":
+            self._atender(servicio.estado_trabajo, ruta[1])
+        elif len(ruta) == 3 and ruta[0] == "trabajos" and ruta[2] == "eventos":
+            try:
+                desde = int(consulta.get("desde", ["0"])[0])
+            except ValueError:
+                self._responder(400, {"error": f"desde debe ser un entero: {consulta['desde'][0]!r}"})
+                return
+            self._transmitir(ruta[1], desde)
+        else:
+            self._responder(404, {"error": f"Ruta desconocida: {self.path}"})
+
+    def do_POST(self):
+        ruta, _ = self._ruta()
+        servicio = self.server.servicio
+        if self.headers.get_content_type() != "application/json":
+            self._responder(415, {"error": "Se espera Content-Type: application/json"})
+            return
+        try:
+            datos = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        except ValueError as e:
+            self._responder(400, {"error": f"JSON inválido: {e}"})
+            return
+        if ruta == ["instancias"]:
+            self._atender(lambda: {datos["nombre"]: servicio.registrar_archivo(datos["nombre"], datos["path"])})
+        elif ruta == ["trabajos"]:
+            self._atender(lambda: {"id": servicio.enviar(**datos)})
+        else:
+            self._responder(404, {"error": f"Ruta desconocida: {self.path}"})
+
+    def do_DELETE(self):
+        ruta, _ = self._ruta()
+        if len(ruta) == 2 and ruta[0] == "trabajos":
+            self._atender(self.server.servicio.cancelar, ruta[1])
+        else:
+            self._responder(404, {"error": f"Ruta desconocida: {self.path}"})
+
+    # Sin registro de cada petición en la consola
+    def log_message(self, formato, *args):
+        pass
+
+    def _ruta(self):
+        partes = parse.urlsplit(self.path)
+        return [p for p in partes.path.split("/") if p], parse.parse_qs(partes.query)
+
+    # Ejecuta una operación del servicio y responde con su resultado o con el error correspondiente
+    def _atender(self, operacion, *args):
+        try:
+            respuesta = operacion(*args)
+        except KeyError as e:
+            self._responder(404, {"error": f"No existe: {e}"})
+        except (TypeError, ValueError, OSError, RuntimeError) as e:
+            self._responder(400, {"error": str(e)})
+        else:
+            self._responder(200, respuesta)
+
+    def _responder(self, codigo, datos):
+        cuerpo = json.dumps(datos, default=float).encode()
+        self.send_response(codigo)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    # Una línea JSON por evento; la conexión se cierra después del evento final (o enseguida si no quedan eventos)
+    def _transmitir(self, id_trabajo, desde):
+        try:
+            eventos = self.server.servicio.eventos(id_trabajo, desde)
+            primeros = list(itertools.islice(eventos, 1))
+        except KeyError as e:
+            self._responder(404, {"error": f"No existe: {e}"})
+            return
+        except ValueError as e:
+            self._responder(400, {"error": str(e)})
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        try:
+            for evento in itertools.chain(primeros, eventos):
+                self.wfile.write(json.dumps(evento, default=float).encode() + b"\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # el cliente se desconectó; el trabajo sigue
+
+
+# Servidor HTTP (un hilo por conexión) sobre un servicio ya creado; puerto 0 = uno libre cualquiera
+def crear_servidor(servicio, host=HOST, puerto=PUERTO):
+    servidor = ThreadingHTTPServer((host, puerto), _Manejador)
+    servidor.servicio = servicio
+    return servidor
+
+
+#Paso 4: Cliente
+class ClienteServicio:
+    def __init__(self, url=f"http://{HOST}:{PUERTO}"):
+        self.url = url.rstrip("/")
+
+    def instancias(self):
+        return self._pedir("GET", "/instancias")
+
+    def registrar(self, nombre, path):
+        return self._pedir("POST", "/instancias", {"nombre": nombre, "path": path})
+
+    def estado(self):
+        return self._pedir("GET", "/estado")
+
+    # Mismos argumentos que ServicioSolver.enviar; devuelve el identificador del trabajo
+    def enviar(self, instancia, algoritmo, **opciones):
+        return self._pedir("POST", "/trabajos", {"instancia": instancia, "algoritmo": algoritmo, **opciones})["id"]
+
+    def estado_trabajo(self, id_trabajo):
+        return self._pedir("GET", f"/trabajos/{id_trabajo}")
+
+    def cancelar(self, id_trabajo):
+        return self._pedir("DELETE", f"/trabajos/{id_trabajo}")
+
+    # Generador de los eventos del trabajo, a medida que llegan
+    def eventos(self, id_trabajo, desde=0):
+        with urlrequest.urlopen(f"{self.url}/trabajos/{id_trabajo}/eventos?desde={desde}") as respuesta:
+            for linea in respuesta:
+                yield json.loads(linea)
+
+    # Envía un trabajo y espera su evento final; por_evento recibe los eventos intermedios
+    def resolver(self, instancia, algoritmo, por_evento=None, **opciones):
+        for evento in self.eventos(self.enviar(instancia, algoritmo, **opciones)):
+            if evento["evento"] in EVENTOS_FINALES:
+                return evento
+            if por_evento is not None:
+                por_evento(evento)
+
+    def _pedir(self, metodo, ruta, datos=None):
+        cuerpo = None if datos is None else json.dumps(datos).encode()
+        peticion = urlrequest.Request(self.url + ruta, data=cuerpo, method=metodo,
+                                      headers={"Content-Type": "application/json"})
+        try:
+            with urlrequest.urlopen(peticion) as respuesta:
+                return json.load(respuesta)
+        except urlerror.HTTPError as e:
+            raise RuntimeError(f"{metodo} {ruta}: {e.code} {json.load(e).get('error', '')}") from None
+
+
+if __name__ == "__main__":
+    from barrido import INSTANCIAS
+
+    parser = argparse.ArgumentParser(description="Servicio local de NSGA-II / SPEA (HTTP en localhost)")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--procesos", type=int, default=None, help="Procesos del pool (por defecto, uno por núcleo)")
+    parser.add_argument("--instancia", action="append", metavar="NOMBRE=ARCHIVO",
+                        help="Instancia a precargar (se puede repetir; por defecto KROAB100 y KROAC100)")
+    parser.add_argument("--directorio-instancias", default=None,
+                        help="Carpeta de la que los clientes pueden registrar instancias (por defecto, ninguna)")
+    args = parser.parse_args()
+
+    instancias = dict(valor.split("=", 1) for valor in args.instancia) if args.instancia else INSTANCIAS
+    servicio = ServicioSolver(instancias, args.procesos, directorio_instancias=args.directorio_instancias)
+    servidor = crear_servidor(servicio, args.host, args.puerto)
+    print(f"Servicio en http://{args.host}:{servidor.server_address[1]} con {servicio.procesos} procesos "
+          f"e instancias {', '.join(servicio.instancias)}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        servicio.cerrar()
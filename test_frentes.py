@@ -0,0 +1,72 @@
+import os
+import random
+
+import numpy as np
+import pytest
+
+import TSP_bi_Objetivo
+from TSP_bi_Objetivo import nsga2
+from utils import cargar_instancia, calcular_frentes, domina
+
+
+# Paridad del ordenamiento no dominado con la implementación O(N²) original (fast-non-dominated-sort):
+# mismos frentes y mismo orden dentro de cada frente, del que depende el desempate del hacinamiento
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+
+# Implementación original, tal como estaba antes del ordenamiento por barrido
+def calcular_frentes_original(costos):
+    frentes = []
+    S = [[] for _ in range(len(costos))]    # Dominados por cada solución
+    n = [0 for _ in range(len(costos))]     # Número de soluciones que dominan a cada solución
+    front = []
+    for p in range(len(costos)):
+        for q in range(len(costos)):
+            if domina(costos[p], costos[q]):
+                S[p].append(q)
+            elif domina(costos[q], costos[p]):
+                n[p] += 1
+        if n[p] == 0:
+            front.append(p)
+    frentes.append(front)
+
+    i = 0
+    while len(frentes[i]) > 0:
+        Q = []
+        for p in frentes[i]:
+            for q in S[p]:
+                n[q] -= 1
+                if n[q] == 0:
+                    Q.append(q)
+        i += 1
+        frentes.append(Q)
+    frentes.pop()
+    return frentes
+
+
+# Costos enteros en rangos chicos: muchos empates y puntos repetidos
+@pytest.mark.parametrize("objetivos", [2, 3])
+@pytest.mark.parametrize("semilla", range(20))
+def test_mismos_frentes_que_el_original(objetivos, semilla):
+    generador = np.random.default_rng(semilla)
+    tamano = int(generador.integers(1, 200))
+    costos = generador.integers(0, int(generador.integers(2, 30)), size=(tamano, objetivos))
+    lista = [tuple(int(v) for v in c) for c in costos]
+    assert calcular_frentes(costos) == calcular_frentes_original(lista)
+
+
+def test_sin_costos():
+    assert calcular_frentes(np.empty((0, 2))) == []
+
+
+# nsga2 con una semilla fija da el mismo resultado que con el ordenamiento original
+def test_nsga2_con_semilla(monkeypatch):
+    num_ciudades, matrices = cargar_instancia(os.path.join(DIRECTORIO, "tsp_KROAB100.TSP.TXT"))
+    rutas, costos = nsga2(num_ciudades, matrices, None, 40, 15, rng=random.Random(7))
+
+    monkeypatch.setattr(TSP_bi_Objetivo, "calcular_frentes",
+                        lambda c: calcular_frentes_original([tuple(x) for x in np.asarray(c).tolist()]))
+    rutas_original, costos_original = nsga2(num_ciudades, matrices, None, 40, 15, rng=random.Random(7))
+    assert np.array_equal(rutas, rutas_original)
+    assert np.array_equal(costos, costos_original)
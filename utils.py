@@ -1,138 +1,475 @@
 
-import math
 import random
 import csv
+import bisect
+import hashlib
+import os
+
+import numpy as np
+
+from instrumentacion import SIN_INSTRUMENTACION
+from archivo_pareto import ArchivoPareto
+from metricas import arreglo_costos
 
 
 #Paso 1: Lectura de instancia
+# Formato: número de ciudades, número de objetivos y una matriz de distancias por objetivo,
+# separadas por una línea en blanco
 def leer_instancia_tsp(ruta_archivo):
     # Abre el archivo con la ruta especificada
     with open(ruta_archivo, 'r') as f:
         # Lee el número de ciudades
         num_ciudades = int(f.readline())
-        # Lee el número de objetivos (esperamos 2)
+        # Lee el número de objetivos (2 en las instancias KROA/KROB/KROC)
         num_objetivos = int(f.readline())
-        
-        # Leer la matriz de distancias para el primer objetivo
-        matriz1 = []
-        for _ in range(num_ciudades):
-            fila = list(map(float, f.readline().split()))
-            matriz1.append(fila)
-        
-        # Leer línea en blanco como separador
-        f.readline()
-        
-        # Leer la matriz de distancias para el segundo objetivo
-        matriz2 = []
-        for _ in range(num_ciudades):
-            fila = list(map(float, f.readline().split()))
-            matriz2.append(fila)
-    
-    # Retorna el número de ciudades y ambas matrices de distancias
-    return num_ciudades, matriz1, matriz2
+
+        matrices = []
+        for k in range(num_objetivos):
+            # Leer línea en blanco como separador
+            if k > 0:
+                f.readline()
+            # Leer la matriz de distancias del objetivo k
+            matriz = []
+            for _ in range(num_ciudades):
+                fila = list(map(float, f.readline().split()))
+                matriz.append(fila)
+            matrices.append(matriz)
+
+    # Retorna el número de ciudades y una matriz de distancias por objetivo
+    # (con 2 objetivos: num_ciudades, matriz1, matriz2)
+    return (num_ciudades, *matrices)
+
+
+# Hash abreviado del contenido de un archivo (identifica la instancia aunque cambie de nombre)
+def huella_archivo(ruta_archivo):
+    with open(ruta_archivo, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()[:16]
+
+# Hash del contenido de una instancia ya cargada (matrices apiladas o InstanciaCoordenadas)
+def huella_instancia(matrices):
+    datos = np.ascontiguousarray(matrices.coordenadas if isinstance(matrices, InstanciaCoordenadas) else matrices)
+    huella = hashlib.sha1(repr((datos.shape, datos.dtype.str)).encode())
+    huella.update(datos)
+    return huella.hexdigest()[:16]
+
+# Instancia en caché binaria: la primera vez se parsea el texto y se guarda un .npy junto al archivo,
+# identificado por el hash de su contenido; las siguientes veces se abre con memory-map (solo lectura),
+# de modo que todos los procesos que cargan la misma instancia comparten las mismas páginas
+def cargar_instancia(ruta_archivo, usar_cache=True):
+    # Una lista o tupla de rutas se interpreta como archivos TSPLIB de coordenadas (uno por objetivo)
+    if isinstance(ruta_archivo, (list, tuple)):
+        return leer_instancia_coordenadas(*ruta_archivo)
+    if not usar_cache:
+        num_ciudades, *matrices = leer_instancia_tsp(ruta_archivo)
+        return num_ciudades, apilar_matrices(*matrices)
+
+    ruta_cache = f"{ruta_archivo}.{huella_archivo(ruta_archivo)}.npy"
+    if not os.path.exists(ruta_cache):
+        num_ciudades, *matrices = leer_instancia_tsp(ruta_archivo)
+        # Se escribe a un temporal y se renombra: otro proceso nunca ve un archivo a medio escribir
+        temporal = f"{ruta_cache}.{os.getpid()}.tmp"
+        with open(temporal, 'wb') as f:
+            np.save(f, apilar_matrices(*matrices))
+        os.replace(temporal, ruta_cache)
+    matrices = np.load(ruta_cache, mmap_mode='r')
+    return matrices.shape[1], matrices
+
+
+# Instancia definida por coordenadas: los costos de las aristas se calculan a demanda
+# (distancia euclídea), sin materializar las matrices n x n de cada objetivo.
+# Se indexa igual que la matriz apilada: instancia[:, origen, destino] -> (objetivos, ...)
+class InstanciaCoordenadas:
+    def __init__(self, coordenadas):
+        self.coordenadas = np.asarray(coordenadas, dtype=float)  # (objetivos, n, 2)
+
+    @property
+    def shape(self):
+        objetivos, n, _ = self.coordenadas.shape
+        return objetivos, n, n
+
+    def __getitem__(self, clave):
+        objetivos, origen, destino = clave
+        origen, destino = np.broadcast_arrays(origen, destino)
+        coordenadas = self.coordenadas[objetivos]
+        diferencia = coordenadas[..., origen, :] - coordenadas[..., destino, :]
+        return np.sqrt((diferencia ** 2).sum(axis=-1))
+
+# Lee las coordenadas de un archivo TSPLIB (sección NODE_COORD_SECTION)
+def leer_coordenadas_tsplib(ruta_archivo):
+    coordenadas = []
+    with open(ruta_archivo, 'r') as f:
+        for linea in f:
+            if linea.strip().startswith("NODE_COORD_SECTION"):
+                break
+        for linea in f:
+            partes = linea.split()
+            if not partes or partes[0] == "EOF":
+                break
+            coordenadas.append((float(partes[1]), float(partes[2])))
+    return coordenadas
+
+# Instancia multiobjetivo a partir de un archivo TSPLIB por objetivo (p. ej. kroA100 + kroB100)
+def leer_instancia_coordenadas(*rutas_archivos):
+    coordenadas = [leer_coordenadas_tsplib(ruta) for ruta in rutas_archivos]
+    if len({len(c) for c in coordenadas}) != 1:
+        raise ValueError("Todos los archivos de coordenadas deben tener la misma cantidad de ciudades")
+    return len(coordenadas[0]), InstanciaCoordenadas(coordenadas)
 
 
 # Paso 2: Calcular costos (objetivos) de una ruta
-def calcular_costos(ruta, matriz1, matriz2):
-    # Calcula la suma de distancias para el primer objetivo
-    costo1 = sum(matriz1[ruta[i]][ruta[i+1]] for i in range(len(ruta)-1))
-    costo1 += matriz1[ruta[-1]][ruta[0]]  # Cierra el ciclo volviendo a la ciudad inicial
-    
-    # Calcula la suma de distancias para el segundo objetivo
-    costo2 = sum(matriz2[ruta[i]][ruta[i+1]] for i in range(len(ruta)-1))
-    costo2 += matriz2[ruta[-1]][ruta[0]]
-    
-    return costo1, costo2
+# Recibe una matriz por objetivo y devuelve una tupla con un costo por objetivo
+def calcular_costos(ruta, *matrices):
+    costos = []
+    for matriz in matrices:
+        # Calcula la suma de distancias para el objetivo
+        costo = sum(matriz[ruta[i]][ruta[i+1]] for i in range(len(ruta)-1))
+        costo += matriz[ruta[-1]][ruta[0]]  # Cierra el ciclo volviendo a la ciudad inicial
+        costos.append(costo)
+    return tuple(costos)
+
+
+# Apila las matrices de los objetivos en un único arreglo (objetivos, n, n)
+# Si matriz2 es None, matriz1 ya es la instancia completa (arreglo apilado o InstanciaCoordenadas)
+def apilar_matrices(matriz1, matriz2=None, *otras):
+    if matriz2 is None:
+        return matriz1
+    return np.stack([np.asarray(matriz, dtype=float) for matriz in (matriz1, matriz2, *otras)])
+
+# Evalúa una población completa de una sola vez
+# poblacion: arreglo (pop, n) de enteros, matrices: arreglo (objetivos, n, n) o InstanciaCoordenadas
+# Devuelve un arreglo (pop, objetivos) con los costos de cada ruta
+# estadisticas: diccionario opcional donde se acumula la cantidad de evaluaciones completas
+def evaluar_poblacion(poblacion, matrices, estadisticas=None):
+    rutas = np.asarray(poblacion, dtype=np.intp)
+    if rutas.ndim == 1:
+        rutas = rutas[np.newaxis, :]
+    if estadisticas is not None:
+        estadisticas["evaluaciones"] = estadisticas.get("evaluaciones", 0) + len(rutas)
+    # Cada ciudad se une con la siguiente, y la última con la primera (cierra el ciclo)
+    siguientes = np.roll(rutas, -1, axis=1)
+    # Indexación avanzada: (objetivos, pop, n) aristas -> suma por ruta -> (pop, objetivos)
+    return matrices[:, rutas, siguientes].sum(axis=2).T
 
 
 #Paso 3: Generar población inicial
 # Genera una única ruta aleatoria (permuta de las ciudades)
-def generar_ruta_aleatoria(num_ciudades):
+# rng: generador de la corrida (random.Random); si no se indica se usa el módulo random global
+def generar_ruta_aleatoria(num_ciudades, rng=None):
+    rng = random if rng is None else rng
     ruta = list(range(num_ciudades))
-    random.shuffle(ruta) #Usa random.shuffle para desordenar las ciudades. Cada ruta representa una posible solución al problema
+    rng.shuffle(ruta) #Usa random.shuffle para desordenar las ciudades. Cada ruta representa una posible solución al problema
     return ruta
 
 # Genera una población de rutas aleatorias y las agrupa como la población inicial del algoritmo.
-def generar_poblacion_inicial(num_ciudades, tam_poblacion):
-    return [generar_ruta_aleatoria(num_ciudades) for _ in range(tam_poblacion)]
+def generar_poblacion_inicial(num_ciudades, tam_poblacion, rng=None):
+    return [generar_ruta_aleatoria(num_ciudades, rng) for _ in range(tam_poblacion)]
+
+# Generador de NumPy de la corrida, para los sorteos en lote (torneos); se deriva del rng de la corrida
+# para que una misma semilla reproduzca ambos
+def crear_generador(rng=None):
+    rng = random if rng is None else rng
+    return np.random.default_rng(rng.getrandbits(64))
 
 
 #Paso 4: Funciones de dominancia y no dominancia
 
-# Verifica si la solución cost1 domina a cost2
+# Verifica si la solución cost1 domina a cost2 (con 2 objetivos, sin recorrer los costos)
 def domina(cost1, cost2):
-    return (cost1[0] <= cost2[0] and cost1[1] <= cost2[1]) and (cost1[0] < cost2[0] or cost1[1] < cost2[1])
+    if len(cost1) == 2:
+        return (cost1[0] <= cost2[0] and cost1[1] <= cost2[1]) and (cost1[0] < cost2[0] or cost1[1] < cost2[1])
+    return all(a <= b for a, b in zip(cost1, cost2)) and any(a < b for a, b in zip(cost1, cost2))
+
+# Matriz de dominancia de un conjunto de costos: D[i, j] es True si la solución i domina a la j
+def matriz_dominancia(costos):
+    c = arreglo_costos(costos)
+    menor_igual = (c[:, np.newaxis, :] <= c[np.newaxis, :, :]).all(axis=2)
+    menor = (c[:, np.newaxis, :] < c[np.newaxis, :, :]).any(axis=2)
+    return menor_igual & menor
 
 # Calcula los frentes de Pareto de un conjunto de soluciones, agrupando soluciones no dominadas en niveles
+# Ordenamiento por barrido para 2 objetivos, O(N log N):
+# se recorren las soluciones ordenadas por (f1, f2) y cada una se ubica, por búsqueda binaria,
+# en el primer frente cuyo último elemento no la domina.
+# Con más objetivos se usa frentes_ens. Cada frente conserva el orden original (ver orden_descubrimiento)
 def calcular_frentes(costos):
+    valores = arreglo_costos(costos)
+    if len(valores) == 0:
+        return []
+    if valores.shape[1] != 2:
+        return orden_descubrimiento(valores, frentes_ens(valores))
+    orden = np.lexsort((valores[:, 1], valores[:, 0]))  # ordena por f1 y desempata por f2
+    f1 = valores[:, 0].tolist()
+    f2 = valores[:, 1].tolist()
+
     frentes = []
-    S = [[] for _ in range(len(costos))]    # Dominados por cada solución
-    n = [0 for _ in range(len(costos))]     # Número de soluciones que dominan a cada solución
-    rank = [0 for _ in range(len(costos))]
-    front = []
-
-    # Compara cada par de soluciones para determinar relaciones de dominancia
-    for p in range(len(costos)):
-        S[p] = []
-        n[p] = 0
-        for q in range(len(costos)):
-            if domina(costos[p], costos[q]):
-                S[p].append(q)
-            elif domina(costos[q], costos[p]):
-                n[p] += 1
-        if n[p] == 0:
-            rank[p] = 0
-            front.append(p)
-    frentes.append(front)
-
-    # Genera frentes sucesivos
-    i = 0
-    while len(frentes[i]) > 0:
-        Q = []
-        for p in frentes[i]:
-            for q in S[p]:
-                n[q] -= 1
-                if n[q] == 0:
-                    rank[q] = i + 1
-                    Q.append(q)
-        i += 1
-        frentes.append(Q)
-    frentes.pop()  # Elimina el último frente vacío
+    ultimos = []  # (f2, f1) del último elemento agregado a cada frente, creciente entre frentes
+    for p in orden.tolist():
+        # El último del frente k domina a p si y solo si (f2, f1) del último < (f2, f1) de p
+        clave = (f2[p], f1[p])
+        k = bisect.bisect_left(ultimos, clave)
+        if k == len(frentes):
+            frentes.append([p])
+            ultimos.append(clave)
+        else:
+            frentes[k].append(p)
+            ultimos[k] = clave
+    return orden_descubrimiento(valores, frentes)
+
+# El ordenamiento O(N²) original devuelve el primer frente en orden ascendente y cada frente siguiente en
+# el orden en que lo descubre: al recorrer el frente anterior en su orden, cada solución entra cuando se
+# procesa el último de sus dominadores en ese frente (con el mismo dominador, por índice ascendente).
+# NSGA-II desempata el hacinamiento con un ordenamiento estable sobre ese orden, así que se reproduce
+# para que los resultados con una misma semilla no cambien
+def orden_descubrimiento(valores, frentes):
+    frentes = [sorted(frente) for frente in frentes]
+    filas = valores.tolist() if valores.shape[1] == 2 and len(frentes) > 1 else None
+    for i in range(1, len(frentes)):
+        if filas is not None and len(frentes[i - 1]) * len(frentes[i]) <= 4096:
+            ultimo = _ultimo_dominador_2d(filas, frentes[i - 1], frentes[i])
+            frentes[i].sort(key=lambda q: (ultimo[q], q))
+        else:
+            actual = np.array(frentes[i])
+            ultimo = _ultimo_dominador(valores[frentes[i - 1]], valores[actual])
+            frentes[i] = actual[np.lexsort((actual, ultimo))].tolist()
     return frentes
 
+# Versión en Python puro para frentes chicos (la más común en NSGA-II), sin el costo fijo de NumPy
+def _ultimo_dominador_2d(filas, anterior, actual):
+    miembros = sorted((filas[p][0], filas[p][1], posicion) for posicion, p in enumerate(anterior))
+    f1 = [m[0] for m in miembros]
+    menos_f2 = [-m[1] for m in miembros]
+    posiciones = [m[2] for m in miembros]
+    ultimo = {}
+    for q in actual:
+        x, y = filas[q]
+        ultimo[q] = max(posiciones[bisect.bisect_left(menos_f2, -y):bisect.bisect_right(f1, x)])
+    return ultimo
+
+# Para cada punto, la mayor posición dentro de `frente` de los miembros que lo dominan
+# Con 2 objetivos, el frente ordenado por f1 tiene f2 no creciente y los dominadores de un punto forman
+# un tramo contiguo, cuyo máximo se obtiene de una tabla dispersa en O(log N); con más, por bloques
+def _ultimo_dominador(frente, puntos, bloque=1000):
+    posiciones = np.arange(len(frente))
+    if frente.shape[1] == 2:
+        orden = np.lexsort((frente[:, 1], frente[:, 0]))
+        inicio = np.searchsorted(-frente[orden, 1], -puntos[:, 1], side="left")
+        fin = np.searchsorted(frente[orden, 0], puntos[:, 0], side="right")
+        return _maximos_tramos(posiciones[orden], inicio, fin)
+    resultado = np.empty(len(puntos), dtype=np.intp)
+    for i in range(0, len(puntos), bloque):
+        p = puntos[i:i + bloque, np.newaxis, :]
+        dominan = (frente[np.newaxis, :, :] <= p).all(axis=2) & (frente[np.newaxis, :, :] < p).any(axis=2)
+        resultado[i:i + bloque] = np.where(dominan, posiciones, -1).max(axis=1)
+    return resultado
+
+# Máximo de valores[inicio[j]:fin[j]] para cada j (tramos no vacíos), con una tabla dispersa:
+# tabla[k][i] = max(valores[i:i + 2**k]) y cada tramo se cubre con dos bloques de potencia de 2
+def _maximos_tramos(valores, inicio, fin):
+    tabla = [valores]
+    while 2 ** len(tabla) <= len(valores):
+        paso = 2 ** (len(tabla) - 1)
+        tabla.append(np.maximum(tabla[-1][:-paso], tabla[-1][paso:]))
+    niveles = np.frexp(fin - inicio)[1] - 1  # floor(log2(largo))
+    resultado = np.empty(len(inicio), dtype=valores.dtype)
+    for k in np.unique(niveles).tolist():
+        j = niveles == k
+        resultado[j] = np.maximum(tabla[k][inicio[j]], tabla[k][fin[j] - 2 ** k])
+    return resultado
+
+# Ordenamiento no dominado eficiente con búsqueda binaria (ENS-BS), para cualquier cantidad de objetivos
+# En orden lexicográfico ninguna solución puede ser dominada por una posterior, así que cada una se ubica,
+# por búsqueda binaria, en el primer frente en el que nadie la domina (si la domina alguien del frente k,
+# también la domina alguien de cada frente anterior). Cada comprobación es una comparación en bloque
+# contra los costos del frente; en la práctica hay pocos frentes y el costo está lejos del O(N²) completo.
+def frentes_ens(valores):
+    valores = arreglo_costos(valores)
+    orden = np.lexsort(valores.T[::-1])  # ordena por f1, desempata por f2, luego f3...
+    frentes = []
+    for p in orden.tolist():
+        costo = valores[p]
+        bajo, alto = 0, len(frentes)
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            miembros = valores[frentes[medio]]
+            if ((miembros <= costo).all(axis=1) & (miembros < costo).any(axis=1)).any():
+                bajo = medio + 1
+            else:
+                alto = medio
+        if bajo == len(frentes):
+            frentes.append([p])
+        else:
+            frentes[bajo].append(p)
+    return [sorted(frente) for frente in frentes]
+
+# Índices de las soluciones no dominadas (primer frente), en una sola pasada O(N log N)
+def indices_no_dominados(costos):
+    valores = arreglo_costos(costos)
+    if len(valores) and valores.shape[1] != 2:
+        return frentes_ens(valores)[0]
+    orden = np.lexsort((valores[:, 1], valores[:, 0]))
+    f1 = valores[:, 0].tolist()
+    f2 = valores[:, 1].tolist()
+    no_dominados = []
+    ultimo = None  # (f2, f1) del último no dominado: es el de menor f2 visto hasta ahora
+    for p in orden.tolist():
+        clave = (f2[p], f1[p])
+        if ultimo is None or not ultimo < clave:
+            no_dominados.append(p)
+            ultimo = clave
+    return sorted(no_dominados)
+
 
 #Paso 6: Operadores genéticos (crossover y mutación)
 
 # Cruce tipo Order Crossover (OX)
-def crossover_OX(parent1, parent2):
+def crossover_OX(parent1, parent2, rng=None):
+    rng = random if rng is None else rng
     size = len(parent1)
     # Selecciona dos puntos aleatorios para el cruce
-    start, end = sorted(random.sample(range(size), 2))
-    child = [None]*size
-    # Copia el segmento del primer padre
-    child[start:end+1] = parent1[start:end+1]
+    start, end = sorted(rng.sample(range(size), 2))
+    return crossover_OX_cortes(parent1, parent2, start, end)
+
+# OX con puntos de corte dados, en O(n): una máscara indica qué ciudades ya están en el hijo
+def crossover_OX_cortes(parent1, parent2, start, end):
+    size = len(parent1)
+    # Copia el segmento del primer padre (el resto se sobrescribe a continuación)
+    child = list(parent1)
+    ubicado = [False]*size
+    for ciudad in parent1[start:end+1]:
+        ubicado[ciudad] = True
 
     # Rellena el resto con genes del segundo padre, en orden, sin duplicados
     fill_pos = (end + 1) % size
-    parent2_pos = (end + 1) % size
-    while None in child:
-        if parent2[parent2_pos] not in child:
-            child[fill_pos] = parent2[parent2_pos]
+    for k in range(size):
+        ciudad = parent2[(end + 1 + k) % size]
+        if not ubicado[ciudad]:
+            child[fill_pos] = ciudad
             fill_pos = (fill_pos + 1) % size
-        parent2_pos = (parent2_pos + 1) % size
     return child
 
-# Mutación por intercambio (swap)
-def mutacion_swap(ruta, prob_mut=0.1):
-    ruta = ruta.copy()
-    if random.random() < prob_mut:
-        i, j = random.sample(range(len(ruta)), 2)
+# OX en lote: cruza cada fila de padres1 (pares, n) con la misma fila de padres2 usando
+# los cortes [inicios[k], fines[k]]; produce los mismos hijos que crossover_OX_cortes
+# out: arreglo (pares, n) donde escribir los hijos (por ejemplo, filas reservadas de una Poblacion)
+def crossover_OX_lote(padres1, padres2, inicios, fines, out=None):
+    padres1 = np.asarray(padres1)
+    padres2 = np.asarray(padres2)
+    pares, size = padres1.shape
+    filas = np.arange(pares)[:, np.newaxis]
+    inicios = np.asarray(inicios)[:, np.newaxis]
+    fines = np.asarray(fines)[:, np.newaxis]
+    columnas = np.arange(size)[np.newaxis, :]
+
+    # Posición de cada ciudad en el primer padre, para saber si cae dentro del segmento copiado
+    posicion1 = np.empty_like(padres1)
+    posicion1[filas, padres1] = columnas
+    # Segundo padre recorrido desde fin+1 (circular); se descartan las ciudades del segmento
+    desde_fin = (fines + 1 + columnas) % size
+    recorrido = padres2[filas, desde_fin]
+    pos_en_1 = posicion1[filas, recorrido]
+    en_segmento = (pos_en_1 >= inicios) & (pos_en_1 <= fines)
+    # Orden estable: primero las ciudades a ubicar, conservando el orden del segundo padre
+    restantes = recorrido[filas, np.argsort(en_segmento, axis=1, kind="stable")]
+
+    if out is None:
+        hijos = padres1.copy()
+    else:
+        hijos = out
+        hijos[:] = padres1
+    a_llenar = columnas < size - (fines - inicios + 1)
+    hijos[np.broadcast_to(filas, (pares, size))[a_llenar], desde_fin[a_llenar]] = restantes[a_llenar]
+    return hijos
+
+# Mutación por intercambio (swap); la ruta se copia solo si efectivamente muta
+def mutacion_swap(ruta, prob_mut=0.1, rng=None):
+    rng = random if rng is None else rng
+    if rng.random() < prob_mut:
+        i, j = rng.sample(range(len(ruta)), 2)
+        ruta = ruta.copy()
         ruta[i], ruta[j] = ruta[j], ruta[i]
     return ruta
 
+# Variación del costo (un valor por objetivo) al intercambiar las posiciones i y j de una ruta
+# Solo cambian las aristas que tocan esas posiciones (a lo sumo 4), por lo que es O(1)
+def delta_swap(ruta, i, j, matrices):
+    n = len(ruta)
+    # Aristas afectadas, identificadas por su posición de origen (p -> p+1)
+    posiciones = list({(i - 1) % n, i, (j - 1) % n, j})
+    intercambiada = {i: ruta[j], j: ruta[i]}
+    origen = [ruta[p] for p in posiciones]
+    destino = [ruta[(p + 1) % n] for p in posiciones]
+    nuevo_origen = [intercambiada.get(p, ruta[p]) for p in posiciones]
+    nuevo_destino = [intercambiada.get((p + 1) % n, ruta[(p + 1) % n]) for p in posiciones]
+    return matrices[:, nuevo_origen, nuevo_destino].sum(axis=1) - matrices[:, origen, destino].sum(axis=1)
+
+# Sorteo de la mutación swap de una ruta de n ciudades: posiciones (i, j) a intercambiar, o None
+# Usa el generador igual que mutacion_swap
+def sortear_swap(n, prob_mut=0.1, rng=None):
+    rng = random if rng is None else rng
+    if rng.random() < prob_mut:
+        return rng.sample(range(n), 2)
+    return None
+
+# Mutación swap sobre un bloque de rutas (pop, n) y sus costos, modificados en el lugar
+# swaps: lo sorteado por sortear_swap para cada fila (None = sin mutación)
+def mutacion_swap_lote(rutas, costos, matrices, swaps, estadisticas=None):
+    mutados = 0
+    for k, swap in enumerate(swaps):
+        if swap is not None:
+            i, j = swap
+            ruta = rutas[k]
+            costos[k] += delta_swap(ruta, i, j, matrices)
+            ruta[i], ruta[j] = ruta[j], ruta[i]
+            mutados += 1
+    if estadisticas is not None and mutados:
+        estadisticas["evaluaciones_delta"] = estadisticas.get("evaluaciones_delta", 0) + mutados
+
+# Genera la descendencia (cruce OX + mutación swap) junto con sus costos
+# El cruce se aplica en lote; los hijos se evalúan una sola vez en bloque (o heredan el costo
+# si son copia de un padre) y la mutación actualiza ese costo de forma incremental
+# Devuelve arreglos (hijos, costos); con destino=(rutas, costos), p. ej. Poblacion.reservar(tam_poblacion),
+# los hijos se escriben directamente en esas filas
+# cache: cache_rutas.CacheCostos opcional; los hijos que ya se evaluaron antes toman su costo de ahí
+def generar_descendencia(seleccion, costos_seleccion, tam_poblacion, matrices, prob_mutacion, rng=None, estadisticas=None,
+                         instrumentacion=SIN_INSTRUMENTACION, destino=None, cache=None):
+    rng = random if rng is None else rng
+    size = len(seleccion[0])
+    with instrumentacion.fase("cruce"):
+        indices1, indices2, inicios, fines, swaps = [], [], [], [], []
+        for i in range(0, tam_poblacion, 2):
+            a, b = i % len(seleccion), (i+1) % len(seleccion)
+            # Se sortea en el mismo orden que el ciclo hijo por hijo: los dos cruces y luego las dos mutaciones
+            for p1, p2 in ((a, b), (b, a)):
+                start, end = sorted(rng.sample(range(size), 2))
+                indices1.append(p1)
+                indices2.append(p2)
+                inicios.append(start)
+                fines.append(end)
+            swaps += [sortear_swap(size, prob_mutacion, rng), sortear_swap(size, prob_mutacion, rng)]
+        indices1, indices2 = np.array(indices1[:tam_poblacion]), np.array(indices2[:tam_poblacion])
+        padres = np.asarray(seleccion)
+        if destino is None:
+            destino = (None, np.empty((tam_poblacion, matrices.shape[0])))
+        hijos, costos = destino
+        hijos = crossover_OX_lote(padres[indices1], padres[indices2], inicios[:tam_poblacion], fines[:tam_poblacion], hijos)
+
+    with instrumentacion.fase("evaluacion"):
+        # Índice en la selección del padre idéntico al hijo, o -1 si hay que evaluarlo
+        origen = np.where((hijos == padres[indices1]).all(axis=1), indices1,
+                          np.where((hijos == padres[indices2]).all(axis=1), indices2, -1))
+        a_evaluar = origen < 0
+        if a_evaluar.any():
+            evaluar = evaluar_poblacion if cache is None else cache.evaluar
+            costos[a_evaluar] = evaluar(hijos[a_evaluar], matrices, estadisticas)
+        costos[~a_evaluar] = costos_seleccion[origen[~a_evaluar]]
+
+    with instrumentacion.fase("mutacion"):
+        mutacion_swap_lote(hijos, costos, matrices, swaps[:tam_poblacion], estadisticas)
+    return hijos, costos
+
 
 # Paso 7: Selección por torneo basada en ranking y crowding distance
-def seleccion_torneo(poblacion, costos, ranks, distancias, k=2):
+def seleccion_torneo(poblacion, costos, ranks, distancias, k=2, rng=None):
+    rng = random if rng is None else rng
     seleccionados = []
     n = len(poblacion)
     k = min(k, n)  # Asegura que k no exceda el tamaño de la población
@@ -141,7 +478,7 @@ def seleccion_torneo(poblacion, costos, ranks, distancias, k=2):
             seleccionados.append(poblacion[0])
             continue
         # Selecciona k candidatos al azar
-        candidatos = random.sample(range(n), k)
+        candidatos = rng.sample(range(n), k)
         mejor = candidatos[0]
         # Compara por ranking y luego por crowding distance
         for c in candidatos[1:]:
@@ -153,51 +490,46 @@ def seleccion_torneo(poblacion, costos, ranks, distancias, k=2):
         seleccionados.append(poblacion[mejor])
     return seleccionados
 
+# Torneo en lote: sortea de una vez los k candidatos (distintos) de los `cantidad` torneos con el
+# generador de NumPy y elige en cada uno el de menor rango y, a igual rango, mayor distancia
+# (ante empate total gana el primer candidato, como en seleccion_torneo). Devuelve los índices ganadores
+def seleccion_torneo_lote(ranks, distancias, cantidad, generador, k=2):
+    ranks = np.asarray(ranks)
+    distancias = np.asarray(distancias, dtype=float)
+    n = len(ranks)
+    k = min(k, n)
+    if n == 1:
+        return np.zeros(cantidad, dtype=np.intp)
+    # Candidatos sin reemplazo: el j-ésimo se sortea entre los n - j restantes y se corre
+    # por encima de cada valor ya elegido que no supere
+    candidatos = np.empty((cantidad, k), dtype=np.intp)
+    for j in range(k):
+        c = generador.integers(0, n - j, size=cantidad)
+        for previo in np.sort(candidatos[:, :j], axis=1).T:
+            c += c >= previo
+        candidatos[:, j] = c
+    mejor = candidatos[:, 0]
+    for j in range(1, k):
+        c = candidatos[:, j]
+        mejora = (ranks[c] < ranks[mejor]) | ((ranks[c] == ranks[mejor]) & (distancias[c] > distancias[mejor]))
+        mejor = np.where(mejora, c, mejor)
+    return mejor
 
-#PASO 11: Métricas M1, M2, M3, Error
-
-# Distancia euclidiana entre dos puntos (2D)
-def distancia_euclidiana(a, b):
-    return math.sqrt((a[0]-b[0])**2 + (a[1]-b[1])**2)
-
-# M1: promedio de distancias del frente obtenido al frente ideal
-def evaluar_M1(frente_algo, ytrue):
-    return sum(min(distancia_euclidiana(a, y) for y in ytrue) for a in frente_algo) / len(frente_algo)
-
-# M2: promedio de distancias del frente ideal al frente obtenido
-def evaluar_M2(frente_algo, ytrue):
-    return sum(min(distancia_euclidiana(y, a) for a in frente_algo) for y in ytrue) / len(ytrue)
 
-# M3: dispersión del frente obtenido (uniformidad)
-def evaluar_M3(frente_algo):
-    if len(frente_algo) <= 1:
-        return 0
-    # Ordenar por f1 para medir dispersión
-    frente_ordenado = sorted(frente_algo, key=lambda x: x[0])
-    distancias = [distancia_euclidiana(frente_ordenado[i], frente_ordenado[i+1]) for i in range(len(frente_ordenado)-1)]
-    return sum(distancias) / len(distancias)
-
-# Error: proporción de soluciones del frente ideal no encontradas
-def evaluar_error(frente_algo, ytrue):
-    ytrue_set = set(tuple(p) for p in ytrue)
-    frente_set = set(tuple(p) for p in frente_algo)
-    no_encontradas = ytrue_set - frente_set
-    return len(no_encontradas) / len(ytrue)
+#PASO 11: Métricas M1, M2, M3, Error
+# Implementadas en metricas.py (vecino más cercano por barrido, hipervolumen, IGD); se reexportan aquí
+from metricas import distancia_euclidiana, evaluar_M1, evaluar_M2, evaluar_M3, evaluar_error
 
 
 # Paso 10: Construcción del frente ideal (Ytrue) a partir de múltiples ejecuciones
+# Los frentes se vuelcan en un archivo de Pareto (sin repetidos, ordenado por f1); para armarlo
+# a medida que terminan las corridas, usar directamente archivo_pareto.ArchivoPareto
+# Con más de 2 objetivos se filtran los no dominados de todos los frentes juntos
 def construir_frente_Ytrue(lista_frentes):
-    # Junta todos los frentes en una sola lista
-    todos_costos = [costo for frente in lista_frentes for costo in frente]
-
-    # Filtrar solo las soluciones no dominadas
-    ytrue = []
-    for i, ci in enumerate(todos_costos):
-        dominado = False
-        for j, cj in enumerate(todos_costos):
-            if i != j and domina(cj, ci):
-                dominado = True
-                break
-        if not dominado:
-            ytrue.append(ci)
-    return ytrue
\ No newline at end of file
+    todos_costos = [tuple(costo) for frente in lista_frentes for costo in frente]
+    if todos_costos and len(todos_costos[0]) != 2:
+        return sorted({todos_costos[i] for i in indices_no_dominados(todos_costos)})
+    archivo = ArchivoPareto()
+    for frente in lista_frentes:
+        archivo.extender(frente)
+    return archivo.costos()